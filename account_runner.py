@@ -0,0 +1,147 @@
+import argparse
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+import time
+
+import api_metrics
+import aws_clients
+import cleanup_scheduler
+import run_journal
+
+# Accounts cleaned by default, with the tag filter of their BossWireless resources from the Readme
+ACCOUNTS = {
+    "idt-qa": ("tech:team_name", ["team_boss_wireless", "team_brmobile"]),
+    "idt-prod": ("tech:team_name", ["team_boss_wireless"]),
+}
+
+# Directory for each account's run journal, event log and output
+log_dir = "."
+
+
+def account_paths(profile, directory=None):
+    """Returns the run journal, event log and output paths of an account, so accounts never share a file."""
+    directory = directory or log_dir
+    return {
+        "journal": os.path.join(directory, f"cleanup_journal-{profile}.db"),
+        "events": os.path.join(directory, f"cleanup-events-{profile}.jsonl"),
+        "output": os.path.join(directory, f"cleanup-{profile}.log"),
+    }
+
+
+def clean_account(profile, tag_key, tag_values, regions=None, directory=None):
+    """
+    Worker process body: runs the deletion scheduler against one account with its own
+    sessions, run journal, event log and output file, and returns a summary of the run.
+    """
+    paths = account_paths(profile, directory)
+    aws_clients.default_profile = profile
+    run_journal.journal_path = paths["journal"]
+    cleanup_scheduler.aws_profile = profile
+    cleanup_scheduler.tag_key = tag_key
+    cleanup_scheduler.tag_values = tag_values
+    cleanup_scheduler.regions = regions
+
+    start = time.monotonic()
+    with open(paths["output"], "a", encoding="utf-8", buffering=1) as output:
+        sys.stdout = output
+        api_metrics.start_run(f"account_runner:{profile}", paths["events"])
+        try:
+            steps = cleanup_scheduler.run_cleanup()
+        finally:
+            api_metrics.finish_run()
+            sys.stdout = sys.__stdout__
+
+    calls = api_metrics.metrics.summary()["calls"].values()
+    return {
+        "profile": profile,
+        "seconds": time.monotonic() - start,
+        "steps": len(steps),
+        "failed_steps": [name for name, (status, _) in steps.items() if status == "failed"],
+        "journal": run_journal.journal.summary(),
+        "api_calls": sum(call["calls"] for call in calls),
+        "throttles": sum(call["throttles"] for call in calls),
+    }
+
+
+def run_accounts(accounts, regions=None, directory=None):
+    """
+    Cleans every account in its own worker process concurrently, so all accounts are
+    cleaned in the time of the slowest one.
+
+    :param accounts: {profile: (tag key, tag values)}
+    :return: {profile: summary}, with the exception in place of the summary for failed accounts.
+    """
+    results = {}
+    # Spawned workers start from fresh modules: no shared sessions, clients, caches or locks
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=len(accounts), mp_context=context) as executor:
+        futures = {}
+        for profile, (tag_key, tag_values) in accounts.items():
+            print(f"▶️ Cleaning {profile} ({tag_key}={','.join(tag_values)}), "
+                  f"output in {account_paths(profile, directory)['output']}")
+            futures[executor.submit(clean_account, profile, tag_key, tag_values, regions, directory)] = profile
+
+        for future in concurrent.futures.as_completed(futures):
+            profile = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ {profile} failed: {e}")
+                results[profile] = e
+                continue
+            status = f"{len(result['failed_steps'])} failed {result['failed_steps']}" if result["failed_steps"] else "no failures"
+            print(f"✅ {profile} finished in {result['seconds']:.1f}s: {result['steps']} steps, {status}")
+            results[profile] = result
+
+    return results
+
+
+def print_results(results, wall_time):
+    summaries = [result for result in results.values() if not isinstance(result, Exception)]
+    print(f"\n{'Account':<20}{'Seconds':>9}{'Steps':>7}{'Failed':>8}{'Deleted':>9}{'Errors':>8}{'API calls':>11}{'Throttled':>11}")
+    for result in summaries:
+        print(f"{result['profile']:<20}{result['seconds']:>9.1f}{result['steps']:>7}{len(result['failed_steps']):>8}"
+              f"{result['journal'].get(run_journal.DELETED, 0):>9}{result['journal'].get(run_journal.FAILED, 0):>8}"
+              f"{result['api_calls']:>11}{result['throttles']:>11}")
+    for profile, result in results.items():
+        if isinstance(result, Exception):
+            print(f"{profile:<20}failed: {result}")
+
+    total = sum(result["seconds"] for result in summaries)
+    print(f"{len(results)} accounts cleaned in {wall_time:.1f}s ({total:.1f}s one after another), "
+          f"{sum(result['journal'].get(run_journal.DELETED, 0) for result in summaries)} resources deleted, "
+          f"{sum(result['api_calls'] for result in summaries)} API calls")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean several AWS accounts in parallel, one worker process per profile.")
+    parser.add_argument("profiles", nargs="*", default=list(ACCOUNTS), help=f"Profiles to clean, from {', '.join(ACCOUNTS)}")
+    parser.add_argument("--tag", action="append", default=[], metavar="PROFILE=KEY=VALUE1,VALUE2",
+                        help="Tag filter of a profile, replacing or adding to the built-in ones")
+    parser.add_argument("--regions", help='Regions to clean in every account, e.g. "us-east-1,eu-west-1" or "all"')
+    parser.add_argument("--log-dir", default=log_dir, help="Directory for each account's journal, event log and output")
+    args = parser.parse_args()
+
+    accounts = dict(ACCOUNTS)
+    for tag in args.tag:
+        try:
+            profile, tag_key, tag_values = tag.split("=", 2)
+        except ValueError:
+            parser.error(f"Invalid tag filter {tag}, expected PROFILE=KEY=VALUE1,VALUE2")
+        accounts[profile] = (tag_key, tag_values.split(","))
+    unknown = [profile for profile in args.profiles if profile not in accounts]
+    if unknown:
+        parser.error(f"No tag filter for {', '.join(unknown)}, add one with --tag")
+
+    os.makedirs(args.log_dir, exist_ok=True)
+    start = time.monotonic()
+    results = run_accounts({profile: accounts[profile] for profile in args.profiles}, args.regions, args.log_dir)
+    print_results(results, time.monotonic() - start)
+    if any(isinstance(result, Exception) or result["failed_steps"] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
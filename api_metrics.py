@@ -0,0 +1,219 @@
+import atexit
+import contextlib
+import datetime
+import functools
+import io
+import json
+import sys
+import threading
+import time
+
+from rate_limiter import THROTTLE_ERROR_CODES
+
+# JSON-lines record of every API call, resource state change, wait and printed message of a run
+events_path = "cleanup-events.jsonl"
+
+
+def percentile(values, fraction):
+    """Returns the value at the given fraction (0-1) of the sorted values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class ApiMetrics:
+    """
+    Per-operation API call accounting, hooked into clients through botocore's event system,
+    plus a JSON-lines event log. Each call is recorded with its service, operation, latency,
+    retry count, whether it was throttled and its outcome.
+    """
+
+    def __init__(self):
+        self.calls = {}     # (service, operation) -> {"latencies": [], "retries", "throttles", "errors"}
+        self.waits = {}     # wait kind -> [count, total seconds, longest]
+        self._events = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Forgets the calls and waits recorded so far."""
+        with self._lock:
+            self.calls = {}
+            self.waits = {}
+
+    def install(self, client):
+        """Registers the accounting hooks on a boto3 client and returns the client."""
+        events = client.meta.events
+        events.register("before-call", functools.partial(self._before_call, client.meta.region_name),
+                        unique_id="api-metrics-before-call")
+        events.register("needs-retry", self._needs_retry, unique_id="api-metrics-needs-retry")
+        events.register("after-call", self._after_call, unique_id="api-metrics-after-call")
+        events.register("after-call-error", self._after_call_error, unique_id="api-metrics-after-call-error")
+        return client
+
+    def _before_call(self, region, model, context, **kwargs):
+        context["metrics"] = {"service": model.service_model.service_name, "operation": model.name, "region": region,
+                              "start": time.monotonic(), "attempts": 0, "throttled": False}
+
+    def _needs_retry(self, request_dict=None, response=None, **kwargs):
+        call = (request_dict or {}).get("context", {}).get("metrics")
+        if call is None:
+            return None
+        call["attempts"] += 1
+        if response is not None and response[1].get("Error", {}).get("Code") in THROTTLE_ERROR_CODES:
+            call["throttled"] = True
+        return None
+
+    def _after_call(self, parsed, context, **kwargs):
+        call = context.pop("metrics", None)
+        if call is not None:
+            self._record(call, parsed.get("Error", {}).get("Code", "ok"))
+
+    def _after_call_error(self, exception, context, **kwargs):
+        call = context.pop("metrics", None)
+        if call is not None:
+            self._record(call, type(exception).__name__)
+
+    def _record(self, call, outcome):
+        latency = time.monotonic() - call["start"]
+        retries = max(0, call["attempts"] - 1)
+        with self._lock:
+            stats = self.calls.setdefault((call["service"], call["operation"]),
+                                          {"latencies": [], "retries": 0, "throttles": 0, "errors": 0})
+            stats["latencies"].append(latency)
+            stats["retries"] += retries
+            stats["throttles"] += call["throttled"]
+            stats["errors"] += outcome != "ok"
+        self.event("api_call", service=call["service"], operation=call["operation"], region=call["region"],
+                   latency=round(latency, 4),
+                   retries=retries, throttled=call["throttled"], outcome=outcome)
+
+    def record_wait(self, kind, seconds):
+        """Adds time spent waiting for a resource state, e.g. a deletion, to the run summary."""
+        with self._lock:
+            wait = self.waits.setdefault(kind, [0, 0.0, 0.0])
+            wait[0] += 1
+            wait[1] += seconds
+            wait[2] = max(wait[2], seconds)
+        self.event("wait", kind=kind, seconds=round(seconds, 3))
+
+    @contextlib.contextmanager
+    def waiting(self, kind):
+        """Context manager recording the time spent in its block as a wait of the given kind."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_wait(kind, time.monotonic() - start)
+
+    def event(self, event, **fields):
+        """Appends one JSON record to the event log, if a run was started."""
+        if self._events is None:
+            return
+        record = {"time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds"),
+                  "event": event, "thread": threading.current_thread().name, **fields}
+        line = json.dumps(record, default=str)
+        with self._lock:
+            if self._events is not None:
+                self._events.write(line + "\n")
+
+    def open_events(self, path=None):
+        with self._lock:
+            if self._events is None:
+                self._events = open(path or events_path, "a", encoding="utf-8", buffering=1)
+
+    def close_events(self):
+        with self._lock:
+            if self._events is not None:
+                self._events.close()
+                self._events = None
+
+    def summary(self):
+        """Returns {"calls": {"service:operation": stats}, "waits": {kind: stats}} for the run so far."""
+        with self._lock:
+            calls = {
+                f"{service}:{operation}": {
+                    "calls": len(stats["latencies"]),
+                    "p50": percentile(stats["latencies"], 0.5),
+                    "p95": percentile(stats["latencies"], 0.95),
+                    "retries": stats["retries"],
+                    "throttles": stats["throttles"],
+                    "errors": stats["errors"],
+                }
+                for (service, operation), stats in self.calls.items()
+            }
+            waits = {kind: {"count": count, "seconds": total, "longest": longest}
+                     for kind, (count, total, longest) in self.waits.items()}
+        return {"calls": calls, "waits": waits}
+
+    def print_summary(self):
+        summary = self.summary()
+        self.event("summary", **summary)
+        calls = summary["calls"]
+        if not calls and not summary["waits"]:
+            return
+
+        print(f"\n📊 {sum(c['calls'] for c in calls.values())} API calls")
+        print(f"{'Operation':<55}{'Calls':>7}{'p50 ms':>9}{'p95 ms':>9}{'Retries':>9}{'Throttled':>11}{'Errors':>8}")
+        for name, stats in sorted(calls.items(), key=lambda item: -item[1]["calls"]):
+            print(f"{name:<55}{stats['calls']:>7}{stats['p50'] * 1000:>9.0f}{stats['p95'] * 1000:>9.0f}"
+                  f"{stats['retries']:>9}{stats['throttles']:>11}{stats['errors']:>8}")
+        for kind, stats in sorted(summary["waits"].items()):
+            print(f"⏳ Waited for {stats['count']} {kind}: {stats['seconds']:.1f}s in total, longest {stats['longest']:.1f}s")
+
+
+class EventTee(io.TextIOBase):
+    """stdout replacement that keeps printing and also logs every printed line as a message event."""
+
+    def __init__(self, stream, metrics):
+        self.stream = stream
+        self.metrics = metrics
+        self._buffer = threading.local()
+
+    def write(self, text):
+        self.stream.write(text)
+        pending = getattr(self._buffer, "text", "") + text
+        *lines, self._buffer.text = pending.split("\n")
+        for line in lines:
+            if line.strip():
+                self.metrics.event("message", text=line)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+# Shared by all clients in the process
+metrics = ApiMetrics()
+_run_name = None
+
+
+def start_run(name, path=None):
+    """
+    Starts structured logging for a script run: opens the event log, mirrors printed output
+    into it and prints the call summary when the process exits.
+    """
+    global _run_name
+    if metrics._events is not None:
+        return
+    _run_name = name
+    metrics.open_events(path)
+    metrics.event("run_started", name=name, argv=sys.argv)
+    if not isinstance(sys.stdout, EventTee):
+        sys.stdout = EventTee(sys.stdout, metrics)
+    atexit.register(finish_run)
+
+
+def finish_run():
+    """
+    Prints the call summary and closes the event log of the run. Called at exit, or earlier
+    by processes that don't exit after the run, e.g. account workers.
+    """
+    if metrics._events is None:
+        return
+    metrics.print_summary()
+    metrics.event("run_finished", name=_run_name)
+    if isinstance(sys.stdout, EventTee):
+        sys.stdout.flush()
+        sys.stdout = sys.stdout.stream
+    metrics.close_events()
@@ -0,0 +1,96 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import threading
+
+# Maximum number of in-flight API calls per service. Waiting resources do not count,
+# they sleep on the event loop between checks.
+SERVICE_CONCURRENCY = {
+    "ec2": 20,
+    "elbv2": 10,
+    "ecs": 10,
+    "s3": 50,
+    "sqs": 20,
+    "cloudwatch": 10,
+    "cloudfront": 5,
+}
+DEFAULT_CONCURRENCY = 10
+
+# Threads running the blocking boto3 calls of every engine in the process. The pool outlives each
+# run, so the per-thread clients its threads created (see aws_clients.get_client) are reused by
+# later pages, regions and steps instead of being created again.
+MAX_THREADS = 64
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Returns the process-wide thread pool of the engines, starting it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_THREADS, thread_name_prefix="engine")
+        return _executor
+
+
+class AsyncCleanupEngine:
+    """
+    Runs delete and wait logic as coroutines on one event loop.
+
+    boto3 calls are blocking, so each call is handed to the shared thread pool while
+    holding the per-service semaphore; the polling between calls is an asyncio.sleep.
+    Thousands of deletions can be waiting at once while only the calls actually
+    talking to AWS occupy a thread.
+    """
+
+    def __init__(self, concurrency=None):
+        """
+        :param concurrency: Per-service concurrency caps overriding SERVICE_CONCURRENCY.
+        """
+        self.concurrency = dict(SERVICE_CONCURRENCY, **(concurrency or {}))
+        self._semaphores = {}
+
+    def _semaphore(self, service):
+        if service not in self._semaphores:
+            self._semaphores[service] = asyncio.Semaphore(self.concurrency.get(service, DEFAULT_CONCURRENCY))
+        return self._semaphores[service]
+
+    async def call(self, service, function, *args, **kwargs):
+        """
+        Runs a blocking function under the service concurrency cap and returns its result. Functions
+        using a LazyClient must look up its operations inside, boto3 calls go through call_api.
+        """
+        async with self._semaphore(service):
+            loop = asyncio.get_running_loop()
+            # Executor threads don't inherit context variables, the current region has to travel along
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(get_executor(), functools.partial(context.run, function, *args, **kwargs))
+
+    async def call_api(self, client, operation, **kwargs):
+        """
+        Calls a boto3 operation by name under the concurrency cap of the client's service. The operation
+        is looked up in the executor thread, so a LazyClient resolves to that thread's own client.
+        """
+        service = getattr(client, "service", None) or client.meta.service_model.service_name
+        return await self.call(service, lambda: getattr(client, operation)(**kwargs))
+
+    async def _gather(self, coroutines):
+        return await asyncio.gather(*coroutines, return_exceptions=True)
+
+    def run(self, coroutines):
+        """
+        Runs coroutines concurrently on a new event loop and returns their results in order.
+        Exceptions are printed and returned in place of the result.
+        """
+        coroutines = list(coroutines)
+        if not coroutines:
+            return []
+
+        self._semaphores = {}
+        results = asyncio.run(self._gather(coroutines))
+
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"❌ Error in coroutine: {result}")
+        return results
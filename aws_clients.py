@@ -0,0 +1,95 @@
+import contextlib
+import contextvars
+import threading
+
+import boto3
+from botocore.config import Config
+
+from api_metrics import metrics
+from rate_limiter import rate_limiter, retry_config
+
+# Profile of clients created without one, set per account by account_runner.py and cleanup.py --profile.
+# Pinned on purpose: AWS_PROFILE or the default profile could silently point a cleanup at another account.
+default_profile = "idt-qa"
+
+# Each client is used by a single thread, so a small pool per client is enough
+client_config = retry_config.merge(Config(max_pool_connections=10, tcp_keepalive=True))
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_thread_clients = threading.local()
+
+# Region used by clients created without an explicit region, None means the profile's default
+current_region = contextvars.ContextVar("current_region", default=None)
+
+
+@contextlib.contextmanager
+def using_region(region):
+    """Makes clients without an explicit region, including lazy clients, use `region` inside the block."""
+    token = current_region.set(region)
+    try:
+        yield
+    finally:
+        current_region.reset(token)
+
+
+def get_session(profile=None):
+    """
+    Returns the cached boto3 Session of a profile, creating it on first use.
+    Clients created from the same session share its resolved credentials.
+    """
+    profile = profile or default_profile
+    with _sessions_lock:
+        if profile not in _sessions:
+            _sessions[profile] = (boto3.Session(profile_name=profile), threading.Lock())
+        return _sessions[profile]
+
+
+def get_client(service, profile=None, region=None):
+    """
+    Returns the calling thread's client for (profile, region, service), creating it on first use.
+    Worker threads never share a client, so they never contend on one HTTP connection pool.
+    Without a region the current region set by using_region() is used.
+    """
+    key = (profile or default_profile, region or current_region.get(), service)
+    clients = getattr(_thread_clients, "clients", None)
+    if clients is None:
+        clients = _thread_clients.clients = {}
+
+    client = clients.get(key)
+    if client is None:
+        session, session_lock = get_session(key[0])
+        # boto3 sessions are not thread safe, client creation is serialized per session
+        with session_lock:
+            client = session.client(service, region_name=key[1], config=client_config)
+        # The limiter goes first, so measured latency excludes time spent waiting for a slot
+        clients[key] = metrics.install(rate_limiter.install(client))
+    return client
+
+
+class LazyClient:
+    """
+    Stand-in for a boto3 client that makes no call and creates no client until it is used.
+    Every attribute access resolves to the current thread's client from get_client(), for the
+    current region when the LazyClient has none of its own.
+    """
+
+    def __init__(self, service, profile=None, region=None):
+        self._service = service
+        self._profile = profile
+        self._region = region
+
+    @property
+    def service(self):
+        return self._service
+
+    def __getattr__(self, name):
+        return getattr(get_client(self._service, self._profile, self._region), name)
+
+    def __repr__(self):
+        return f"LazyClient({self._service!r}, profile={self._profile!r}, region={self._region!r})"
+
+
+def lazy_client(service, profile=None, region=None):
+    """Returns a LazyClient for module-level use."""
+    return LazyClient(service, profile, region)
@@ -0,0 +1,108 @@
+import concurrent.futures
+import threading
+import time
+
+from aws_clients import get_client, using_region
+from resource_record import get_resource
+
+
+def get_enabled_regions(aws_profile=None):
+    """Returns the regions enabled in the account of a profile, asked from its default region."""
+    response = get_client("ec2", aws_profile).describe_regions()
+    return sorted(region["RegionName"] for region in response["Regions"])
+
+
+def resolve_regions(regions, aws_profile=None):
+    """
+    Turns a region setting into a list of regions:
+    None -> [None], the profile's default region only
+    "all" -> every region enabled in the account
+    "us-east-1,eu-west-1" or a list -> those regions
+    """
+    if regions is None:
+        return [None]
+    if regions == "all":
+        return get_enabled_regions(aws_profile)
+    if isinstance(regions, str):
+        return [region.strip() for region in regions.split(",") if region.strip()]
+    return list(regions)
+
+
+def group_by_region(arns):
+    """
+    Groups ARNs by region, keeping their order. ARNs of global resources (S3, CloudFront)
+    have no region and go to None, which uses the profile's default region.
+    """
+    groups = {}
+    for arn in arns:
+        groups.setdefault(get_resource(arn).region or None, []).append(arn)
+    return groups
+
+
+def run_in_regions(tasks, label="Sweep"):
+    """
+    Runs {region: function} concurrently, one thread per region, each with its region as
+    the current region, so its clients, rate limits and status checks are its own.
+    A sweep takes as long as the slowest region instead of the sum of all of them.
+
+    :return: {region: result}, with the exception in place of the result for failed regions.
+    """
+    def run(region, function):
+        with using_region(region):
+            start = time.monotonic()
+            try:
+                return function(), time.monotonic() - start
+            except Exception as e:
+                return e, time.monotonic() - start
+
+    if not tasks:
+        return {}
+    if len(tasks) == 1:
+        (region, function), = tasks.items()
+        result, _ = run(region, function)
+        if isinstance(result, Exception):
+            print(f"❌ {label} failed in {region or 'default region'}: {result}")
+        return {region: result}
+
+    start = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="region") as executor:
+        futures = {region: executor.submit(run, region, function) for region, function in tasks.items()}
+        outcomes = {region: future.result() for region, future in futures.items()}
+
+    for region, (result, duration) in sorted(outcomes.items(), key=lambda item: -item[1][1]):
+        status = f"failed: {result}" if isinstance(result, Exception) else "done"
+        print(f"🌍 {label} in {region or 'default region'}: {status} in {duration:.1f}s")
+    print(f"🌍 {label} in {len(tasks)} regions took {time.monotonic() - start:.1f}s")
+    return {region: result for region, (result, _) in outcomes.items()}
+
+
+def delete_in_regions(delete_function, arns, **kwargs):
+    """
+    Splits ARNs by region and runs a cleanup module's delete function (taking a list of ARNs)
+    on each region's share concurrently.
+    """
+    groups = group_by_region(arns)
+    return run_in_regions({region: (lambda a=region_arns: delete_function(a, **kwargs))
+                           for region, region_arns in groups.items()},
+                          label=getattr(delete_function, "__name__", "Cleanup"))
+
+
+def delete_streamed(delete_function, pages, pages_in_flight=2, **kwargs):
+    """
+    Deletes resources page by page as discovery yields them (see resource_inventory.stream_resources):
+    each page of Resource records goes to delete_in_regions in a worker thread while the next page is
+    being fetched. At most `pages_in_flight` pages are being deleted at once, discovery waits for one
+    of them to finish, so memory stays bounded.
+
+    :return: Number of resources handed to delete_function.
+    """
+    slots = threading.BoundedSemaphore(pages_in_flight)
+    total = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=pages_in_flight, thread_name_prefix="page") as executor:
+        for page in pages:
+            slots.acquire()
+            total += len(page)
+            # The page is held until its deletion is done, so its records are not parsed again
+            future = executor.submit(lambda p=page: delete_in_regions(delete_function, [r.arn for r in p], **kwargs))
+            future.add_done_callback(lambda _: slots.release())
+    return total
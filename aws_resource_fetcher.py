@@ -1,35 +1,22 @@
-import boto3
+from resource_inventory import get_inventory
+from resource_record import get_resource
 
 
-def get_resources_by_tag(tag_key, tag_values, resource_type, aws_profile):
-    session = boto3.Session(profile_name=aws_profile)
-    tagging_client = session.client("resourcegroupstaggingapi")
+def get_resources_by_tag(tag_key, tag_values, resource_type, aws_profile, regions=None):
     """
     Fetches all AWS resources of a specific type that have a given tag and tag_values list.
-    Handles pagination to ensure all resources are retrieved.
+    Resources come from the shared inventory, so the tagging API is paged through only once
+    per tag filter no matter how many resource types are requested.
+
+    :param regions: Regions to search, "all" for every enabled region, None for the profile's default region.
     """
     res_arns = []
-    next_token = None
 
     try:
-        while True:
-            # Fetch resources (handle pagination)
-            response = tagging_client.get_resources(
-                TagFilters=[{"Key": tag_key, "Values": tag_values}],
-                ResourceTypeFilters=[resource_type],
-                PaginationToken=next_token if next_token else ""
-            )
-
-            # Extract ARNs
-            for resource in response.get("ResourceTagMappingList", []):
-                resource_arn = resource["ResourceARN"]
-                print(f"Found resource: {resource_arn}")
-                res_arns.append(resource_arn)
-
-            # Check if there are more pages
-            next_token = response.get("PaginationToken")
-            if not next_token:
-                break  # Exit loop if no more pages
+        inventory = get_inventory(tag_key, tag_values, aws_profile, regions=regions)
+        for resource_arn in inventory.resources(resource_type, tag_values=tag_values):
+            print(f"Found resource: {resource_arn}")
+            res_arns.append(resource_arn)
 
     except Exception as e:
         print(f"❌ Error fetching resources for {resource_type}: {e}")
@@ -42,29 +29,6 @@ def get_id_from_arn(arn):
     Extracts the resource ID from an AWS ARN, handling different ARN formats.
 
     :param arn: The AWS resource ARN (string)
-    :return: Extracted resource ID (string)
+    :return: Extracted resource ID (string), e.g. an instance ID, bucket, queue or alarm name
     """
-    # Split ARN into parts
-    arn_parts = arn.split(":")
-
-    if len(arn_parts) < 6:
-        raise ValueError(f"Invalid ARN format: {arn}")
-
-    service = arn_parts[2]  # Extract the AWS service name
-    resource_part = arn_parts[5]  # The part containing the resource identifier
-
-    # Handle common formats
-    if service in ["ec2", "elasticloadbalancing", "rds", "dynamodb", "elasticache"]:
-        return resource_part.split("/")[-1]  # Last part after "/"
-
-    elif service in ["s3"]:
-        return resource_part  # S3 ARN contains bucket name directly
-
-    elif service in ["lambda", "sqs", "sns", "cloudwatch"]:
-        return resource_part.split(":")[-1]  # Last part after ":"
-
-    elif service in ["cloudfront"]:
-        return resource_part.split("/")[-1]  # CloudFront has "distribution/<id>"
-
-    else:
-        raise ValueError(f"Unsupported ARN service: {service}")
\ No newline at end of file
+    return get_resource(arn).id
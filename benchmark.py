@@ -0,0 +1,456 @@
+import argparse
+import importlib
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from botocore.awsrequest import AWSResponse
+
+# Profiles the cleanup scripts use, written to a throwaway AWS config for the stand-in
+benchmark_profiles = ["idt-qa", "idt-prod"]
+benchmark_region = "us-east-1"
+
+TAGS = [{"Key": "to_delete", "Value": "yes"}, {"Key": "tech:team_name", "Value": "team_boss_wireless"}]
+
+# Synthetic account size per case, override with --size name=value
+DEFAULT_SIZES = {
+    "instances": 50,
+    "network_interfaces": 20,
+    "security_groups": 100,
+    "volumes": 0,
+    "load_balancers": 20,
+    "target_groups": 500,
+    "task_definitions": 10000,
+    "buckets": 5,
+    "objects": 2000,
+    "bucket_versions": 100000,
+    "queues": 200,
+    "alarms": 500,
+    "distributions": 10,
+}
+
+
+class MockRawResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+def throttle_response(request, service):
+    """Builds the throttling error each service protocol returns, or None where it can't be faked."""
+    headers = {k.lower(): v for k, v in request.headers.items()}
+    content_type = headers.get("content-type", "")
+    if isinstance(content_type, bytes):
+        content_type = content_type.decode()
+
+    if "cbor" in content_type:
+        return None
+    if "x-amz-target" in headers or "json" in content_type:
+        status, body = 400, b'{"__type": "ThrottlingException", "message": "Rate exceeded"}'
+        headers = {"Content-Type": "application/x-amz-json-1.1", "x-amzn-query-error": "Throttling;Sender"}
+    elif service == "ec2":
+        status, body, headers = 503, (b"<Response><Errors><Error><Code>RequestLimitExceeded</Code>"
+                                      b"<Message>Request limit exceeded.</Message></Error></Errors>"
+                                      b"<RequestID>benchmark</RequestID></Response>"), {}
+    elif service == "s3":
+        status, body, headers = 503, (b"<Error><Code>SlowDown</Code><Message>Please reduce your request rate."
+                                      b"</Message></Error>"), {}
+    else:
+        status, body, headers = 400, (b"<ErrorResponse><Error><Type>Sender</Type><Code>Throttling</Code>"
+                                      b"<Message>Rate exceeded</Message></Error>"
+                                      b"<RequestId>benchmark</RequestId></ErrorResponse>"), {}
+    return AWSResponse(request.url, status, headers, MockRawResponse(body))
+
+
+class AwsStandIn:
+    """
+    before-send hook answering every request from moto.
+
+    moto's backends are not thread safe, so requests are handed to moto one at a time.
+    The hook counts every attempt per operation, optionally adds a fixed network latency
+    outside of the lock and throttles operations called more than `throttle_rate` times
+    per second, the same way AWS would.
+    """
+
+    def __init__(self, latency=0.0, throttle_rate=None):
+        from moto.core.models import botocore_stubber
+        self.stubber = botocore_stubber
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.enabled = False
+        self.calls = {}
+        self.throttles = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._moto_lock = threading.Lock()
+
+    def install(self, session):
+        # botocore calls every before-send handler, so moto's own one has to go
+        session.events.unregister("before-send", self.stubber)
+        session.events.register_first("before-send", self, unique_id="benchmark-stand-in")
+
+    def _throttled(self, operation):
+        if not self.throttle_rate:
+            return False
+        now = time.monotonic()
+        tokens, last = self._buckets.get(operation, (self.throttle_rate, now))
+        tokens = min(self.throttle_rate, tokens + (now - last) * self.throttle_rate)
+        throttled = tokens < 1
+        self._buckets[operation] = (tokens if throttled else tokens - 1, now)
+        return throttled
+
+    def __call__(self, event_name, request, **kwargs):
+        _, service, operation = event_name.split(".", 2)
+        if self.enabled:
+            if self.latency:
+                time.sleep(self.latency * random.uniform(0.5, 1.5))
+            with self._lock:
+                key = f"{service}:{operation}"
+                self.calls[key] = self.calls.get(key, 0) + 1
+                throttled = self._throttled(key)
+                if throttled:
+                    self.throttles[key] = self.throttles.get(key, 0) + 1
+            if throttled:
+                response = throttle_response(request, service)
+                if response is not None:
+                    return response
+
+        with self._moto_lock:
+            return self.stubber(event_name, request, **kwargs)
+
+
+def snapshot_tag_scans():
+    """
+    moto serves later GetResources pages by resuming a generator over its live backends, which
+    fails once the cleanup deletes resources between pages. Like AWS, take each scan in full
+    when its first page is requested, so deletions can run while discovery is still paging.
+    """
+    from moto.resourcegroupstaggingapi.models import ResourceGroupsTaggingAPIBackend
+
+    scan = ResourceGroupsTaggingAPIBackend._get_resources_generator
+    if getattr(scan, "snapshot", False):
+        return
+
+    def snapshot(self, *args, **kwargs):
+        return iter(list(scan(self, *args, **kwargs)))
+
+    snapshot.snapshot = True
+    ResourceGroupsTaggingAPIBackend._get_resources_generator = snapshot
+
+
+class PeakMemory:
+    """Samples the resident set size of the process in the background and keeps the peak."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.start_rss = self.peak_rss = self.rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def rss():
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            # No procfs, fall back to the process peak
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self.rss())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self.rss())
+
+
+def seed_ec2(client, sizes):
+    ec2 = client("ec2")
+    vpc_id = ec2.describe_vpcs()["Vpcs"][0]["VpcId"]
+    subnet_id = ec2.describe_subnets()["Subnets"][0]["SubnetId"]
+    image_id = ec2.describe_images()["Images"][0]["ImageId"]
+
+    for i in range(0, sizes["instances"], 100):
+        count = min(100, sizes["instances"] - i)
+        ec2.run_instances(ImageId=image_id, MinCount=count, MaxCount=count, SubnetId=subnet_id,
+                          TagSpecifications=[{"ResourceType": "instance", "Tags": TAGS}])
+
+    for i in range(sizes["network_interfaces"]):
+        ec2.create_network_interface(SubnetId=subnet_id, TagSpecifications=[
+            {"ResourceType": "network-interface", "Tags": TAGS}])
+
+    # Every group allows traffic from the previous one, so none can go before its referrer
+    group_ids = []
+    for i in range(sizes["security_groups"]):
+        group_id = ec2.create_security_group(GroupName=f"bench-sg-{i}", Description="benchmark", VpcId=vpc_id,
+                                             TagSpecifications=[{"ResourceType": "security-group", "Tags": TAGS}])["GroupId"]
+        if group_ids:
+            ec2.authorize_security_group_ingress(GroupId=group_id, IpPermissions=[{
+                "IpProtocol": "tcp", "FromPort": 443, "ToPort": 443,
+                "UserIdGroupPairs": [{"GroupId": group_ids[-1]}]}])
+        group_ids.append(group_id)
+
+    for i in range(sizes["volumes"]):
+        ec2.create_volume(AvailabilityZone=f"{benchmark_region}a", Size=1,
+                          TagSpecifications=[{"ResourceType": "volume", "Tags": TAGS}])
+
+
+def seed_lb(client, sizes):
+    ec2 = client("ec2")
+    elb = client("elbv2")
+    vpc_id = ec2.describe_vpcs()["Vpcs"][0]["VpcId"]
+    subnet_ids = [subnet["SubnetId"] for subnet in ec2.describe_subnets()["Subnets"]][:2]
+
+    target_group_arns = []
+    for i in range(sizes["target_groups"]):
+        target_group_arns.append(elb.create_target_group(
+            Name=f"bench-tg-{i}", Protocol="HTTP", Port=80, VpcId=vpc_id, Tags=TAGS)["TargetGroups"][0]["TargetGroupArn"])
+
+    for i in range(sizes["load_balancers"]):
+        lb_arn = elb.create_load_balancer(Name=f"bench-lb-{i}", Subnets=subnet_ids, Tags=TAGS)["LoadBalancers"][0]["LoadBalancerArn"]
+        if i < len(target_group_arns):
+            elb.create_listener(LoadBalancerArn=lb_arn, Protocol="HTTP", Port=80, DefaultActions=[
+                {"Type": "forward", "TargetGroupArn": target_group_arns[i]}])
+
+
+def seed_ecs(client, sizes):
+    ecs = client("ecs")
+    tags = [{"key": tag["Key"], "value": tag["Value"]} for tag in TAGS]
+    for i in range(sizes["task_definitions"]):
+        ecs.register_task_definition(family=f"bench-{i % 100}", tags=tags,
+                                     containerDefinitions=[{"name": "app", "image": "app:latest", "memory": 128}])
+
+
+def seed_s3(client, sizes):
+    from moto.core import DEFAULT_ACCOUNT_ID
+    from moto.s3.models import s3_backends
+
+    s3 = client("s3")
+    # Objects go straight into the moto backend, millions of put_object calls would take hours
+    backend = s3_backends[DEFAULT_ACCOUNT_ID]["aws"]
+    tag_set = {"TagSet": TAGS}
+
+    s3.create_bucket(Bucket="bench-versioned")
+    s3.put_bucket_tagging(Bucket="bench-versioned", Tagging=tag_set)
+    s3.put_bucket_versioning(Bucket="bench-versioned", VersioningConfiguration={"Status": "Enabled"})
+    for i in range(sizes["bucket_versions"]):
+        backend.put_object("bench-versioned", f"key-{i % 1000}/{i // 1000}", b"x")
+
+    for b in range(sizes["buckets"]):
+        bucket = f"bench-bucket-{b}"
+        s3.create_bucket(Bucket=bucket)
+        s3.put_bucket_tagging(Bucket=bucket, Tagging=tag_set)
+        for i in range(sizes["objects"]):
+            backend.put_object(bucket, f"object-{i}", b"x")
+
+
+def seed_sqs(client, sizes):
+    sqs = client("sqs")
+    for i in range(sizes["queues"]):
+        sqs.create_queue(QueueName=f"bench-queue-{i}", tags={tag["Key"]: tag["Value"] for tag in TAGS})
+
+
+def seed_cloudwatch(client, sizes):
+    cloudwatch = client("cloudwatch")
+    for i in range(sizes["alarms"]):
+        cloudwatch.put_metric_alarm(AlarmName=f"bench-alarm-{i}", MetricName="Errors", Namespace="Benchmark",
+                                    Statistic="Sum", Period=60, EvaluationPeriods=1, Threshold=1,
+                                    ComparisonOperator="GreaterThanThreshold", Tags=TAGS)
+
+
+def seed_cloudfront(client, sizes):
+    cloudfront = client("cloudfront")
+    for i in range(sizes["distributions"]):
+        cloudfront.create_distribution_with_tags(DistributionConfigWithTags={
+            "DistributionConfig": {
+                "CallerReference": f"bench-{i}",
+                "Comment": "benchmark",
+                "Enabled": True,
+                "Origins": {"Quantity": 1, "Items": [{"Id": "origin", "DomainName": "example.com",
+                                                      "CustomOriginConfig": {"HTTPPort": 80, "HTTPSPort": 443,
+                                                                             "OriginProtocolPolicy": "https-only"}}]},
+                "DefaultCacheBehavior": {"TargetOriginId": "origin", "ViewerProtocolPolicy": "allow-all",
+                                         "MinTTL": 0, "ForwardedValues": {"QueryString": False,
+                                                                          "Cookies": {"Forward": "none"}}},
+            },
+            "Tags": {"Items": TAGS},
+        })
+
+
+# Case name -> (cleanup module run through its main(), seed function)
+CASES = {
+    "ec2": ("cleanup_ec2", seed_ec2),
+    "lb": ("cleanup_lb", seed_lb),
+    "ecs": ("cleanup_ecs", seed_ecs),
+    "s3": ("cleanup_s3", seed_s3),
+    "sqs": ("cleanup_sqs", seed_sqs),
+    "cloudwatch": ("cleanup_cloudwatch", seed_cloudwatch),
+    "cloudfront": ("cleanup_cloudfront", seed_cloudfront),
+}
+
+
+def run_case(name, sizes, latency, throttle_rate):
+    """Seeds a fresh moto account, runs one cleanup script against it and returns its measurements."""
+    from moto import mock_aws
+
+    import api_metrics
+    import aws_clients
+    import run_journal
+    from aws_clients import get_client, get_session
+
+    module_name, seed = CASES[name]
+    with tempfile.TemporaryDirectory() as journal_dir, mock_aws():
+        run_journal.journal_path = os.path.join(journal_dir, "journal.db")
+        api_metrics.events_path = os.path.join(journal_dir, "events.jsonl")
+        aws_clients.default_profile = benchmark_profiles[0]
+        snapshot_tag_scans()
+        stand_in = AwsStandIn(latency, throttle_rate)
+        for profile in benchmark_profiles:
+            stand_in.install(get_session(profile)[0])
+
+        seed_start = time.monotonic()
+        seed(lambda service: get_client(service, benchmark_profiles[0]), sizes)
+        seed_time = time.monotonic() - seed_start
+
+        module = importlib.import_module(module_name)
+        api_metrics.metrics.reset()
+        stand_in.enabled = True
+        with PeakMemory() as memory:
+            start = time.monotonic()
+            module.main()
+            wall_time = time.monotonic() - start
+        stand_in.enabled = False
+
+    return {
+        "case": name,
+        "seed_seconds": round(seed_time, 2),
+        "wall_seconds": round(wall_time, 2),
+        "api_calls": sum(stand_in.calls.values()),
+        "calls_per_operation": dict(sorted(stand_in.calls.items())),
+        "throttles": sum(stand_in.throttles.values()),
+        "throttles_per_operation": dict(sorted(stand_in.throttles.items())),
+        "peak_rss_mb": round(memory.peak_rss / 2 ** 20, 1),
+        "rss_growth_mb": round((memory.peak_rss - memory.start_rss) / 2 ** 20, 1),
+        "waits": api_metrics.metrics.summary()["waits"],
+    }
+
+
+def write_aws_config(directory):
+    """Writes config and credentials files with fake keys for every profile the scripts use."""
+    config_path = os.path.join(directory, "config")
+    credentials_path = os.path.join(directory, "credentials")
+    with open(config_path, "w") as config, open(credentials_path, "w") as credentials:
+        for profile in benchmark_profiles:
+            config.write(f"[profile {profile}]\nregion = {benchmark_region}\n")
+            credentials.write(f"[{profile}]\naws_access_key_id = testing\naws_secret_access_key = testing\n")
+    return {"AWS_CONFIG_FILE": config_path, "AWS_SHARED_CREDENTIALS_FILE": credentials_path,
+            "AWS_DEFAULT_REGION": benchmark_region}
+
+
+def run_case_process(name, args, sizes, env):
+    """Runs a case in its own interpreter, so module caches and memory don't leak between cases."""
+    with tempfile.NamedTemporaryFile(suffix=".json") as result_file:
+        command = [sys.executable, os.path.abspath(__file__), "--case", name, "--result", result_file.name,
+                   "--latency", str(args.latency), "--sizes", json.dumps(sizes)]
+        if args.throttle_rate:
+            command += ["--throttle-rate", str(args.throttle_rate)]
+        output = None if args.verbose else subprocess.DEVNULL
+        process = subprocess.run(command, env=env, stdout=output, stderr=subprocess.STDOUT if output else None)
+        if process.returncode != 0:
+            print(f"❌ Benchmark {name} failed with exit code {process.returncode}")
+            return None
+        return json.load(result_file)
+
+
+def print_results(results, baseline=None):
+    baseline = {r["case"]: r for r in (baseline or [])}
+
+    def delta(result, key):
+        previous = baseline.get(result["case"], {}).get(key)
+        if not previous:
+            return ""
+        return f" ({(result[key] - previous) / previous:+.0%})"
+
+    print(f"\n{'Case':<12}{'Wall s':>18}{'API calls':>20}{'Peak RSS MB':>20}{'Throttles':>12}")
+    for result in results:
+        print(f"{result['case']:<12}"
+              f"{str(result['wall_seconds']) + delta(result, 'wall_seconds'):>18}"
+              f"{str(result['api_calls']) + delta(result, 'api_calls'):>20}"
+              f"{str(result['peak_rss_mb']) + delta(result, 'peak_rss_mb'):>20}"
+              f"{result['throttles']:>12}")
+
+    for result in results:
+        print(f"\n{result['case']} calls per operation:")
+        for operation, calls in sorted(result["calls_per_operation"].items(), key=lambda item: -item[1]):
+            throttles = result["throttles_per_operation"].get(operation, 0)
+            print(f"  {operation:<50}{calls:>8}" + (f"  {throttles} throttled" if throttles else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cleanup scripts against synthetic moto accounts.")
+    parser.add_argument("cases", nargs="*", default=list(CASES), help=f"Cases to run, from {', '.join(CASES)}")
+    parser.add_argument("--size", action="append", default=[], metavar="NAME=COUNT",
+                        help=f"Override a synthetic account size, from {', '.join(DEFAULT_SIZES)}")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds of latency per API call")
+    parser.add_argument("--throttle-rate", type=float, help="Throttle operations called more often per second")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of the cleanup scripts")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    parser.add_argument("--sizes", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Child process running one case
+    if args.case:
+        result = run_case(args.case, json.loads(args.sizes), args.latency, args.throttle_rate)
+        with open(args.result, "w") as result_file:
+            json.dump(result, result_file)
+        return
+
+    sizes = dict(DEFAULT_SIZES)
+    for override in args.size:
+        name, count = override.split("=")
+        if name not in sizes:
+            parser.error(f"Unknown size {name}")
+        sizes[name] = int(count)
+
+    results = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        env = dict(os.environ, **write_aws_config(config_dir))
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(os.path.abspath(__file__)), env.get("PYTHONPATH")]))
+        for name in args.cases:
+            print(f"▶️ Running benchmark {name}...")
+            result = run_case_process(name, args, sizes, env)
+            if result:
+                print(f"✅ {name}: {result['wall_seconds']}s, {result['api_calls']} API calls")
+                results.append(result)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as compare_file:
+            baseline = json.load(compare_file)["results"]
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"sizes": sizes, "latency": args.latency, "throttle_rate": args.throttle_rate,
+                       "results": results}, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+
+import async_engine
+import aws_clients
+import cleanup_watch
+from api_metrics import start_run
+from cleanup_scheduler import DELETION_STEPS, INVENTORY_TYPES, run_cleanup
+from resource_inventory import ResourceInventory, get_inventory, scan_regions
+
+tag_key = "to_delete"
+tag_values = ["yes"]
+
+# Service name -> cleanup module deleting its resources. A module is imported only when
+# its service is selected and has resources to delete.
+SERVICES = {
+    "ec2": "cleanup_ec2",
+    "lb": "cleanup_lb",
+    "ecs": "cleanup_ecs",
+    "s3": "cleanup_s3",
+    "sqs": "cleanup_sqs",
+    "cloudwatch": "cleanup_cloudwatch",
+    "cloudfront": "cleanup_cloudfront",
+}
+
+
+def service_resource_types(services):
+    """Returns the inventory resource types the given services delete, in deletion order."""
+    modules = {SERVICES[service] for service in services}
+    return list(dict.fromkeys(INVENTORY_TYPES.get(resource_type, resource_type)
+                              for resource_type, module, _, _ in DELETION_STEPS if module in modules))
+
+
+def discover(args):
+    """Scans the tagged resources of the selected services and prints how many there are of each type."""
+    inventory = get_inventory(args.tag_key, args.tag_values, args.profile, regions=args.regions)
+    inventory = inventory.subset(service_resource_types(args.services))
+    for resource_type, count in sorted(inventory.resource_types().items()):
+        print(f"{resource_type:<36}{count:>7}")
+    print(f"Found {len(inventory.resources())} resources tagged {args.tag_key} in {args.tag_values}")
+    return inventory
+
+
+def plan(args):
+    """Prints the deletion plan of the discovered resources left to delete, without deleting anything."""
+    from cleanup_planner import print_plan
+    from run_journal import journal
+
+    inventory = discover(args)
+    # The delete functions skip the resources the run journal has recently confirmed deleted
+    pending = ResourceInventory(inventory.tag_key, inventory.tag_values, [], inventory.regions)
+    for arn in journal.unfinished(inventory.records):
+        pending.add_record(inventory.records[arn])
+    return print_plan(pending)
+
+
+def delete(args):
+    """Deletes the discovered resources with the deletion scheduler, or only plans it with --dry-run."""
+    if args.dry_run:
+        print("Dry run, nothing is deleted")
+        return plan(args)
+    return run_cleanup(discover(args), max_workers=args.steps)
+
+
+def verify(args):
+    """
+    Checks which tagged resources still exist with batched describe calls. The tagging API keeps
+    listing deleted resources for a while and the run journal may be stale, so neither is trusted.
+    """
+    from cleanup_planner import verify_plan
+
+    mappings = scan_regions(args.tag_key, args.tag_values, args.profile, args.regions)
+    inventory = ResourceInventory(args.tag_key, args.tag_values, mappings, args.regions)
+    return verify_plan(inventory.subset(service_resource_types(args.services)), args.profile)
+
+
+def watch(args):
+    """Keeps deleting newly tagged resources of the selected services, rescanning every --interval seconds."""
+    watcher = cleanup_watch.InventoryWatcher(args.tag_key, args.tag_values, args.profile, args.regions,
+                                             service_resource_types(args.services), max_workers=args.steps)
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+
+COMMANDS = {"discover": discover, "plan": plan, "delete": delete, "verify": verify, "watch": watch}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover, plan, delete and verify tagged BossWireless resources.")
+    parser.add_argument("command", choices=COMMANDS, help="discover: list, plan: dry-run plan, "
+                                                          "delete: delete, verify: check what still exists, "
+                                                          "watch: keep deleting newly tagged resources")
+    parser.add_argument("--services", default=",".join(SERVICES),
+                        help=f"Comma separated services to clean, from {', '.join(SERVICES)}")
+    parser.add_argument("--tag", default=f"{tag_key}={','.join(tag_values)}", metavar="KEY=VALUE1,VALUE2",
+                        help="Tag filter of the resources to clean")
+    parser.add_argument("--profile", help=f"AWS profile, {aws_clients.default_profile} when not set")
+    parser.add_argument("--regions", help='Regions to clean, e.g. "us-east-1,eu-west-1" or "all"')
+    parser.add_argument("--concurrency", type=int, help="Maximum in-flight API calls per service")
+    parser.add_argument("--steps", type=int, default=16, help="Maximum deletion steps running at once")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the deletion plan")
+    parser.add_argument("--interval", type=int, default=cleanup_watch.interval,
+                        help="Seconds between two tagging scans in watch mode")
+    args = parser.parse_args()
+
+    args.services = [service.strip() for service in args.services.split(",") if service.strip()]
+    unknown = [service for service in args.services if service not in SERVICES]
+    if unknown:
+        parser.error(f"Unknown services {', '.join(unknown)}, choose from {', '.join(SERVICES)}")
+    if "=" not in args.tag:
+        parser.error(f"Invalid tag filter {args.tag}, expected KEY=VALUE1,VALUE2")
+    args.tag_key, values = args.tag.split("=", 1)
+    args.tag_values = values.split(",")
+    if args.profile:
+        aws_clients.default_profile = args.profile
+    if args.concurrency:
+        async_engine.SERVICE_CONCURRENCY.update(dict.fromkeys(async_engine.SERVICE_CONCURRENCY, args.concurrency))
+        async_engine.DEFAULT_CONCURRENCY = args.concurrency
+
+    start_run(f"cleanup {args.command}")
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,93 @@
-import boto3
-import time
-from aws_resource_fetcher import get_resources_by_tag,get_id_from_arn
+import asyncio
+from async_engine import AsyncCleanupEngine
+from aws_resource_fetcher import get_id_from_arn
+from aws_regions import delete_streamed
+from resource_inventory import stream_resources
+from status_poller import poller, cloudfront_disabled_checker
+from aws_clients import lazy_client
+from run_journal import journal
+from api_metrics import start_run
 
-session = boto3.Session(profile_name="idt-qa")
-cloudfront_client = session.client("cloudfront")
-tagging_client = session.client("resourcegroupstaggingapi")
+tag_key = "tech:team_name"
+tag_values = ["team_boss_wireless", "team_brmobile"]
+resource_type = "cloudfront:distribution"  # AWS ResourceTypeFilters format
+aws_profile = None  # None uses aws_clients.default_profile
+# Regions to clean, e.g. ["us-east-1", "eu-west-1"], "all" for every enabled region, None for the profile's default
+regions = None
+
+cloudfront_client = lazy_client("cloudfront", aws_profile)
 
+# Distributions waiting to be disabled are tracked together with one list_distributions per tick
+rt_disabled_distribution = "cloudfront:disabled-distribution"
+poller.add_checker(rt_disabled_distribution, cloudfront_disabled_checker(cloudfront_client),
+                   batch_size=1000, interval=20, state="disabled")
 
-def wait_for_cloudfront_disabled(distribution_id, max_attempts=30, wait_time=20):
-    """Waits until the CloudFront distribution is fully disabled before deleting it."""
-    attempts = 0
-    while attempts < max_attempts:
-        response = cloudfront_client.get_distribution(Id=distribution_id)
-        status = response["Distribution"]["Status"]
-        enabled = response["Distribution"]["DistributionConfig"]["Enabled"]
 
-        print(f"Checking CloudFront distribution {distribution_id} status: {status}, Enabled: {enabled}")
+async def disable_cloudfront_distribution_async(engine, distribution_id):
+    """Requests disabling of a distribution without waiting for the change to deploy."""
+    response = await engine.call_api(cloudfront_client, "get_distribution_config", Id=distribution_id)
+    config = response["DistributionConfig"]
 
-        if not enabled and status == "Deployed":
-            print(f"✅ CloudFront Distribution {distribution_id} is now disabled and ready for deletion.")
-            return True
+    if config["Enabled"]:
+        print(f"Disabling CloudFront Distribution {distribution_id}...")
+        config["Enabled"] = False
+        await engine.call_api(cloudfront_client, "update_distribution",
+                              Id=distribution_id, DistributionConfig=config, IfMatch=response["ETag"])
 
-        time.sleep(wait_time)
-        attempts += 1
 
-    print(f"⚠️ Timeout: CloudFront distribution {distribution_id} is still not disabled after {max_attempts * wait_time} seconds.")
-    return False
+async def disable_and_delete_cloudfront_distribution_async(engine, distribution_arn, timeout=900, in_flight=False):
+    """
+    Disables a distribution, waits for it in the shared poller together with all other
+    distributions being disabled, and deletes it with a fresh ETag as soon as it is deployed.
 
-def disable_and_delete_cloudfront_distribution(distribution_id):
-    """Disables and deletes a CloudFront distribution safely."""
+    :param in_flight: Disabling was already requested by an earlier run, only wait for it.
+    """
+    distribution_id = get_id_from_arn(distribution_arn)
     try:
-        # Step 1: Get distribution config
-        response = cloudfront_client.get_distribution_config(Id=distribution_id)
-        etag = response["ETag"]
-        config = response["DistributionConfig"]
-
-        # Step 2: Disable distribution if not already disabled
-        if config["Enabled"]:
-            print(f"Disabling CloudFront Distribution {distribution_id}...")
-            config["Enabled"] = False  # Modify config to disable
-
-            # Step 3: Disable distribution
-            cloudfront_client.update_distribution(
-                Id=distribution_id, DistributionConfig=config, IfMatch=etag
-            )
-
-            # Step 4: Wait for CloudFront to fully disable
-            if not wait_for_cloudfront_disabled(distribution_id):
-                print(f"❌ Failed to disable CloudFront distribution {distribution_id}.")
-                return
-
-        # Step 5: Get new ETag and delete distribution
-        etag = cloudfront_client.get_distribution_config(Id=distribution_id)["ETag"]
-        cloudfront_client.delete_distribution(Id=distribution_id, IfMatch=etag)
+        if not in_flight:
+            await disable_cloudfront_distribution_async(engine, distribution_id)
+            journal.requested(distribution_arn)
+
+        if not await asyncio.wrap_future(poller.register(rt_disabled_distribution, distribution_id, timeout)):
+            journal.failed(distribution_arn, f"not disabled after {timeout}s")
+            print(f"❌ Failed to disable CloudFront distribution {distribution_id}.")
+            return
+
+        response = await engine.call_api(cloudfront_client, "get_distribution_config", Id=distribution_id)
+        await engine.call_api(cloudfront_client, "delete_distribution", Id=distribution_id, IfMatch=response["ETag"])
+        journal.deleted(distribution_arn)
         print(f"✅ Deleted CloudFront Distribution: {distribution_id}")
 
     except Exception as e:
+        # Gone before it was disabled or deleted here, e.g. deleted by someone else
+        if "NoSuchDistribution" in str(e):
+            journal.deleted(distribution_arn)
+            print(f"CloudFront Distribution {distribution_id} no longer exists.")
+            return
+        journal.failed(distribution_arn, e)
         print(f"❌ Error deleting CloudFront Distribution {distribution_id}: {e}")
 
-tag_key = "tech:team_name"
-tag_values = ["team_boss_wireless", "team_brmobile"]
-resource_type = "cloudfront:distribution"  # AWS ResourceTypeFilters format
-aws_profile = "idt-qa"
-
-cf_distrs = get_resources_by_tag(tag_key, tag_values, resource_type, aws_profile)
-# Print results
-print(f"Total CloudFront distributions found: {len(cf_distrs)}")
-for cf in cf_distrs:
-    cf_id = get_id_from_arn(cf)
-    disable_and_delete_cloudfront_distribution(cf_id)
+
+def delete_cloudfront_distributions(cf_distrs, concurrency=None):
+    """
+    Disables every CloudFront distribution with the given ARNs concurrently, then tracks all of
+    them in one list_distributions polling loop and deletes each as soon as it is disabled.
+
+    :param concurrency: Per-service concurrency caps, e.g. {"cloudfront": 10}.
+    """
+    cf_distrs = journal.unfinished(cf_distrs)
+    in_flight = journal.in_flight(cf_distrs)
+    engine = AsyncCleanupEngine(concurrency)
+    engine.run(disable_and_delete_cloudfront_distribution_async(engine, cf, in_flight=cf in in_flight) for cf in cf_distrs)
+
+
+def main():
+    start_run("cleanup_cloudfront")
+    # Distributions start disabling page by page while the tagging API is still being paged through
+    pages = stream_resources(tag_key, tag_values, aws_profile, regions, [resource_type])
+    total = delete_streamed(delete_cloudfront_distributions, pages)
+    print(f"Total CloudFront distributions found: {total}")
+
+
+if __name__ == "__main__":
+    main()
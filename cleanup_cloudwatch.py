@@ -1,65 +1,171 @@
-import boto3
-import time
-import concurrent.futures
-from aws_resource_fetcher import get_resources_by_tag, get_id_from_arn
-
-session = boto3.Session(profile_name="idt-qa")
-cloudwatch_client = session.client("cloudwatch")
+import asyncio
+import re
+from async_engine import AsyncCleanupEngine
+from aws_resource_fetcher import get_id_from_arn, get_resources_by_tag
+from status_poller import poller, alarm_checker, chunks
+from aws_clients import lazy_client
+from aws_regions import delete_in_regions
+from run_journal import journal
+from api_metrics import start_run
 
 tag_key = "tech:team_name"
 tag_values = ["team_boss_wireless", "team_brmobile"]
 resource_type = "cloudwatch:alarm"  # AWS ResourceTypeFilters format
-aws_profile = "idt-qa"
+aws_profile = None  # None uses aws_clients.default_profile
+# Regions to clean, e.g. ["us-east-1", "eu-west-1"], "all" for every enabled region, None for the profile's default
+regions = None
+
+cloudwatch_client = lazy_client("cloudwatch", aws_profile)
+
+poller.add_checker(resource_type, alarm_checker(cloudwatch_client), batch_size=100)
 
+# Delete alarms 100 names per delete_alarms call instead of one call per alarm
+batch_mode = True
 
-def wait_for_alarm_deletion(alarm_name, max_attempts=30, wait_time=5):
+
+async def delete_cloudwatch_alarm_async(engine, alarm_arn, max_attempts=30, wait_time=5, in_flight=False):
     """
-    Polls CloudWatch to confirm an alarm has been deleted.
+    Deletes one CloudWatch Alarm and awaits its deletion in the shared poller.
 
-    :param alarm_name: The name of the alarm to check.
-    :param max_attempts: Max number of polling attempts before timeout.
-    :param wait_time: Time (in seconds) to wait between checks.
-    :return: True if alarm is deleted, False if timeout reached.
+    :param in_flight: Deletion was already requested by an earlier run, only wait for it.
     """
-    attempts = 0
-    while attempts < max_attempts:
-        try:
-            response = cloudwatch_client.describe_alarms(AlarmNames=[alarm_name])
-            if not response["MetricAlarms"]:
-                print(f"✅ Alarm {alarm_name} is fully deleted.")
-                return True  # Alarm is gone
-        except cloudwatch_client.exceptions.ResourceNotFoundException:
-            print(f"✅ Alarm {alarm_name} no longer exists.")
-            return True  # AWS officially reports it as deleted
-        except Exception as e:
-            print(f"⚠️ Error checking alarm {alarm_name}: {e}")
-
-        print(f"⏳ Waiting for alarm {alarm_name} to be deleted... ({attempts + 1}/{max_attempts})")
-        time.sleep(wait_time)
-        attempts += 1
-
-    print(f"❌ Timeout: Alarm {alarm_name} was not deleted after {max_attempts * wait_time} seconds.")
-    return False
-
-def delete_cloudwatch_alarm(alarm_name):
-    """Deletes a CloudWatch Alarm."""
+    alarm_name = get_id_from_arn(alarm_arn)
     try:
-        cloudwatch_client.delete_alarms(AlarmNames=[alarm_name])
-        print(f"🚀 Requested deletion of CloudWatch Alarm: {alarm_name}")
-        wait_for_alarm_deletion(alarm_name)  # Wait for full deletion
+        if not in_flight:
+            await engine.call_api(cloudwatch_client, "delete_alarms", AlarmNames=[alarm_name])
+            journal.requested(alarm_arn)
+            print(f"🚀 Requested deletion of CloudWatch Alarm: {alarm_name}")
+        if await asyncio.wrap_future(poller.register(resource_type, alarm_name, timeout=max_attempts * wait_time)):
+            journal.deleted(alarm_arn)
+        else:
+            journal.failed(alarm_arn, "still exists after waiting")
     except Exception as e:
+        journal.failed(alarm_arn, e)
         print(f"Error deleting CloudWatch Alarm {alarm_name}: {e}")
 
-cw_alarms = get_resources_by_tag(tag_key, tag_values, resource_type, aws_profile)
-# Print results
-print(f"Total CloudWatch Alarms found: {len(cw_alarms)}")
 
-# Delete alarms in parallel using ThreadPoolExecutor
-with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-    futures = {executor.submit(delete_cloudwatch_alarm, get_id_from_arn(alarm)): alarm for alarm in cw_alarms}
+# Alarm referenced in a composite alarm rule, e.g. ALARM("cpu-high") or OK(arn:aws:cloudwatch:...:alarm:cpu-high).
+# Quoted names run to the closing quote and may hold parentheses or escaped quotes.
+ALARM_RULE_REFERENCE = re.compile(r'\b(?:ALARM|OK|INSUFFICIENT_DATA)\(\s*(?:"((?:[^"\\]|\\.)*)"|([^\s")]+))\s*\)')
+
+
+def get_rule_references(alarm_rule):
+    r"""
+    Returns the names of the alarms a composite alarm rule references, ARNs reduced to names.
+
+    >>> sorted(get_rule_references('ALARM("cpu (high)") OR OK(arn:aws:cloudwatch:us-east-1:1:alarm:disk)'))
+    ['cpu (high)', 'disk']
+    >>> sorted(get_rule_references(r'ALARM("say \"hi\"") AND NOT INSUFFICIENT_DATA( "a\\b" )'))
+    ['a\\b', 'say "hi"']
+    """
+    return {(re.sub(r'\\(.)', r'\1', quoted) if quoted else bare).split(":alarm:")[-1]
+            for quoted, bare in ALARM_RULE_REFERENCE.findall(alarm_rule)}
+
+
+def get_alarm_references(alarm_names):
+    """
+    Returns {name: names of the alarms its rule references} of the alarms that exist, with one
+    describe_alarms per 100 names. Metric alarms reference nothing and map to None.
+    """
+    alarms = {}
+    paginator = cloudwatch_client.get_paginator("describe_alarms")
+    for batch in chunks(alarm_names, 100):
+        for page in paginator.paginate(AlarmNames=batch, AlarmTypes=["MetricAlarm", "CompositeAlarm"]):
+            alarms.update({alarm["AlarmName"]: None for alarm in page.get("MetricAlarms", [])})
+            for alarm in page.get("CompositeAlarms", []):
+                alarms[alarm["AlarmName"]] = get_rule_references(alarm["AlarmRule"])
+    return alarms
+
+
+def deletion_waves(alarms):
+    """
+    Orders alarms into waves deleted one after another: first the composite alarms no other composite
+    alarm being deleted references, then the ones only they referenced, and so on, metric alarms last.
+    Composite alarms referencing each other in a cycle go together in one wave.
+    """
+    remaining = {name for name, references in alarms.items() if references is not None}
+    waves = []
+    while remaining:
+        referenced = set().union(*(alarms[name] for name in remaining))
+        wave = remaining - referenced or set(remaining)
+        waves.append(sorted(wave))
+        remaining -= wave
+    waves.append([name for name, references in alarms.items() if references is None])
+    return waves
+
+
+async def delete_alarm_batch_async(engine, arns_by_name, in_flight, timeout=150):
+    """
+    Deletes up to 100 alarms with one delete_alarms call and waits for them with the shared poller,
+    which checks them with one paginated describe_alarms per tick.
+    """
+    names = list(arns_by_name)
+    to_delete = [name for name in names if arns_by_name[name] not in in_flight]
+    try:
+        if to_delete:
+            await engine.call_api(cloudwatch_client, "delete_alarms", AlarmNames=to_delete)
+            journal.requested([arns_by_name[name] for name in to_delete])
+            print(f"🚀 Requested deletion of {len(to_delete)} CloudWatch Alarms")
+        gone = await asyncio.gather(*(asyncio.wrap_future(poller.register(resource_type, name, timeout=timeout))
+                                      for name in names))
+    except Exception as e:
+        # A failed delete_alarms call deletes none of its alarms
+        journal.failed(list(arns_by_name.values()), e)
+        print(f"Error deleting CloudWatch Alarms {', '.join(names)}: {e}")
+        return
+    journal.deleted([arns_by_name[name] for name, alarm_gone in zip(names, gone) if alarm_gone])
+    journal.failed([arns_by_name[name] for name, alarm_gone in zip(names, gone) if not alarm_gone],
+                   "still exists after waiting")
+
+
+def delete_cloudwatch_alarms_in_batches(cw_alarms, concurrency=None):
+    """
+    Deletes alarms in chunks of 100 names, composite alarms first: an alarm referenced by a
+    composite alarm's rule cannot be deleted before that composite alarm. All alarms of a region
+    have to be passed at once for the order to hold.
+    """
+    arns_by_name = {get_id_from_arn(arn): arn for arn in journal.unfinished(cw_alarms)}
+    if not arns_by_name:
+        return
+    in_flight = journal.in_flight(list(arns_by_name.values()))
+    try:
+        alarms = get_alarm_references(list(arns_by_name))
+    except Exception as e:
+        print(f"Error describing CloudWatch Alarms: {e}")
+        return
+
+    gone = [arn for name, arn in arns_by_name.items() if name not in alarms]
+    if gone:
+        print(f"{len(gone)} CloudWatch Alarms do not exist or are already deleted")
+        journal.deleted(gone)
+
+    engine = AsyncCleanupEngine(concurrency)
+    for names in deletion_waves(alarms):
+        engine.run(delete_alarm_batch_async(engine, {name: arns_by_name[name] for name in batch}, in_flight)
+                   for batch in chunks(names, 100))
+
+
+def delete_cloudwatch_alarms(cw_alarms, concurrency=None):
+    """
+    Deletes the CloudWatch Alarms with the given ARNs concurrently on one event loop.
+
+    :param concurrency: Per-service concurrency caps, e.g. {"cloudwatch": 20}.
+    """
+    if batch_mode:
+        return delete_cloudwatch_alarms_in_batches(cw_alarms, concurrency)
+    cw_alarms = journal.unfinished(cw_alarms)
+    in_flight = journal.in_flight(cw_alarms)
+    engine = AsyncCleanupEngine(concurrency)
+    engine.run(delete_cloudwatch_alarm_async(engine, alarm, in_flight=alarm in in_flight) for alarm in cw_alarms)
+
+
+def main():
+    start_run("cleanup_cloudwatch")
+    # Every page is collected first, a composite alarm on a later page has to go before the alarms it watches
+    cw_alarms = get_resources_by_tag(tag_key, tag_values, resource_type, aws_profile, regions)
+    delete_in_regions(delete_cloudwatch_alarms, cw_alarms)
+    print(f"Total CloudWatch Alarms found: {len(cw_alarms)}")
+
 
-    for future in concurrent.futures.as_completed(futures):
-        try:
-            future.result()  # Raise exceptions if any occurred
-        except Exception as e:
-            print(f"❌ Error in thread: {e}")
+if __name__ == "__main__":
+    main()
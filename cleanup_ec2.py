@@ -0,0 +1,540 @@
+import asyncio
+
+from async_engine import AsyncCleanupEngine
+from resource_inventory import get_inventory
+from aws_resource_fetcher import get_id_from_arn
+from status_poller import (poller, network_interface_checker, security_group_checker, volume_checker,
+                           snapshot_checker, network_interface_detached_checker, volume_detached_checker)
+from aws_clients import lazy_client
+from aws_regions import group_by_region, run_in_regions
+from run_journal import journal
+from api_metrics import metrics, start_run
+
+aws_profile = None  # None uses aws_clients.default_profile
+# Regions to clean, e.g. ["us-east-1", "eu-west-1"], "all" for every enabled region, None for the profile's default
+regions = None
+ec2_client = lazy_client("ec2", aws_profile)
+
+rt_instance = "ec2:instance"
+rt_network_interface = "ec2:network-interface"
+rt_security_group = "ec2:security-group"
+rt_volume = "ec2:volume"
+rt_snapshot = "ec2:snapshot"
+
+# Pending ENIs, SGs, volumes and snapshots are checked with one multi-ID describe per type and tick
+poller.add_checker(rt_network_interface, network_interface_checker(ec2_client), batch_size=200)
+poller.add_checker(rt_security_group, security_group_checker(ec2_client), batch_size=200)
+poller.add_checker(rt_volume, volume_checker(ec2_client), batch_size=200, interval=15)
+poller.add_checker(rt_snapshot, snapshot_checker(ec2_client), batch_size=200)
+# Detached ENIs and volumes are deleted once they are available again
+poller.add_checker(f"{rt_network_interface}:detach", network_interface_detached_checker(ec2_client),
+                   batch_size=200, state="detached")
+poller.add_checker(f"{rt_volume}:detach", volume_detached_checker(ec2_client), batch_size=200, state="detached")
+
+tag = "to_delete"
+value = "yes"
+
+# Terminate all instances at once instead of one terminate/wait cycle per instance
+bulk_mode = True
+
+def get_ec2_resources_by_tag(tag_key, tag_values, resource_type):
+    res_arns = []
+    try:
+        inventory = get_inventory(tag_key, tag_values, aws_profile, regions=regions)
+
+        # Extract ARNs
+        for ec2_arn in inventory.resources(resource_type, tag_values=tag_values):
+            print(f"EC2 Resource marked for deletion: {ec2_arn}")
+            res_arns.append(ec2_arn)
+
+    except Exception as e:
+        print(f"Error fetching tagged EC2 resources: {e}")
+
+    return res_arns
+
+
+def check_instance_exists(instance_id):
+    """Checks if an EC2 instance exists before attempting to terminate it."""
+    try:
+        response = ec2_client.describe_instances(InstanceIds=[instance_id])
+
+        # If Reservations list is not empty, instance exists
+        if response["Reservations"]:
+            print(f"Instance {instance_id} exists.")
+            return True
+        else:
+            print(f"Instance {instance_id} does NOT exist.")
+            return False
+
+    except ec2_client.exceptions.ClientError as e:
+        if "InvalidInstanceID.NotFound" in str(e):
+            print(f"Instance {instance_id} does not exist or is already terminated.")
+            return False
+        else:
+            print(f"Error checking instance {instance_id}: {e}")
+            return False
+
+
+def delete_instances(instances_to_delete):
+    for instance_arn in instances_to_delete:
+        try:
+            instance_id = get_id_from_arn(instance_arn)
+            if check_instance_exists(instance_id):
+                terminate_instance_and_wait(instance_id)
+        except Exception as e:
+            print(f"Error terminating EC2 instance {instance_arn}: {e}")
+
+def terminate_instance_and_wait(instance_id):
+    try:
+        # Step 1: Terminate the instance
+        print(f"Terminating EC2 instance: {instance_id}")
+        ec2_client.terminate_instances(InstanceIds=[instance_id])
+        # Step 2: Wait for instance to be fully terminated
+        print(f"Waiting for EC2 instance {instance_id} to be terminated...")
+        waiter = ec2_client.get_waiter("instance_terminated")
+        with metrics.waiting(rt_instance):
+            waiter.wait(InstanceIds=[instance_id])
+        print(f"EC2 instance {instance_id} is now terminated.")
+    except Exception as e:
+        print(f"Error terminating EC2 instance {instance_id}: {e}")
+
+
+def chunks(items, size):
+    """Splits a list into consecutive chunks of at most `size` items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def get_existing_instance_ids(instance_ids):
+    """
+    Returns the subset of instance IDs that still exist and are not terminated.
+    Uses a paginated instance-id filter instead of one describe_instances call per ID,
+    so unknown IDs are simply absent from the result instead of raising NotFound.
+    """
+    existing = []
+    paginator = ec2_client.get_paginator("describe_instances")
+    # EC2 accepts up to 200 values per filter
+    for batch in chunks(instance_ids, 200):
+        pages = paginator.paginate(Filters=[
+            {"Name": "instance-id", "Values": batch},
+            {"Name": "instance-state-name", "Values": ["pending", "running", "shutting-down", "stopping", "stopped"]},
+        ])
+        for page in pages:
+            for reservation in page["Reservations"]:
+                existing.extend(instance["InstanceId"] for instance in reservation["Instances"])
+
+    missing = set(instance_ids) - set(existing)
+    if missing:
+        print(f"{len(missing)} instances do not exist or are already terminated: {sorted(missing)}")
+    return existing
+
+
+def terminate_instances_in_bulk(instance_ids, batch_size=1000, arns=None):
+    """
+    Terminates instances in batches of up to 1000 IDs and waits for the whole set at once.
+
+    :param arns: {instance ID: ARN} of the instances to record in the run journal.
+    """
+    arns = arns or {}
+    requested = []
+    for batch in chunks(instance_ids, batch_size):
+        try:
+            ec2_client.terminate_instances(InstanceIds=batch)
+            print(f"Requested termination of {len(batch)} EC2 instances: {batch}")
+            requested.extend(batch)
+            journal.requested([arns[i] for i in batch if i in arns])
+        except Exception as e:
+            print(f"Error terminating EC2 instances {batch}: {e}")
+            journal.failed([arns[i] for i in batch if i in arns], e)
+
+    if not requested:
+        return
+
+    # Every instance is already shutting down, so waiting batch by batch costs one termination cycle
+    print(f"Waiting for {len(requested)} EC2 instances to be terminated...")
+    waiter = ec2_client.get_waiter("instance_terminated")
+    for batch in chunks(requested, batch_size):
+        try:
+            with metrics.waiting(rt_instance):
+                waiter.wait(InstanceIds=batch)
+            journal.deleted([arns[i] for i in batch if i in arns])
+        except Exception as e:
+            print(f"Error waiting for EC2 instances {batch} to terminate: {e}")
+            journal.failed([arns[i] for i in batch if i in arns], e)
+    print(f"{len(requested)} EC2 instances are now terminated.")
+
+
+def delete_instances_in_bulk(instances_to_delete):
+    arns = {get_id_from_arn(instance_arn): instance_arn for instance_arn in journal.unfinished(instances_to_delete)}
+    try:
+        existing_ids = get_existing_instance_ids(list(arns))
+    except Exception as e:
+        print(f"Error checking EC2 instances: {e}")
+        return
+    # Instances already gone count as deleted, so the next run doesn't look them up again
+    journal.deleted([arn for instance_id, arn in arns.items() if instance_id not in existing_ids])
+    terminate_instances_in_bulk(existing_ids, arns=arns)
+
+
+class SecurityGroupGraph:
+    """
+    In-memory security group reference graph of a region, loaded with one paginated
+    describe_security_groups scan and filtered describe_network_interfaces calls: which
+    groups' rules reference each group, and which network interfaces still use it.
+    """
+
+    def __init__(self):
+        self.groups = {}        # SG ID -> description
+        self.referrers = {}     # SG ID -> IDs of the other groups whose rules reference it
+        self.interfaces = {}    # SG ID -> IDs of the network interfaces using it
+
+    def add_group(self, group):
+        group_id = group["GroupId"]
+        self.groups[group_id] = group
+        for permission in group.get("IpPermissions", []) + group.get("IpPermissionsEgress", []):
+            for pair in permission.get("UserIdGroupPairs", []):
+                # A group referencing itself does not block its own deletion
+                if pair.get("GroupId") and pair["GroupId"] != group_id:
+                    self.referrers.setdefault(pair["GroupId"], set()).add(group_id)
+
+    def rules_referencing(self, group_id, referenced):
+        """Returns the (ingress, egress) IpPermissions of a group that reference any of the `referenced` groups."""
+        def matching(permissions):
+            rules = []
+            for permission in permissions:
+                pairs = [{key: pair[key] for key in ("GroupId", "UserId") if key in pair}
+                         for pair in permission.get("UserIdGroupPairs", []) if pair.get("GroupId") in referenced]
+                if pairs:
+                    rule = {key: permission[key] for key in ("IpProtocol", "FromPort", "ToPort") if key in permission}
+                    rules.append(dict(rule, UserIdGroupPairs=pairs))
+            return rules
+
+        group = self.groups[group_id]
+        return matching(group.get("IpPermissions", [])), matching(group.get("IpPermissionsEgress", []))
+
+    def references_to_revoke(self, group_ids):
+        """
+        Returns {referrer: referenced group IDs} of the rules that have to be revoked before the groups
+        can be deleted: rules of groups that are kept, and rules of groups that reference each other in
+        a cycle. Groups referenced only by other groups being deleted are deleted after those instead.
+        """
+        to_delete = set(group_ids)
+        revoke = {}
+        for group_id in to_delete:
+            for referrer in self.referrers.get(group_id, set()) - to_delete:
+                revoke.setdefault(referrer, set()).add(group_id)
+
+        # Kahn's algorithm: groups left once no group is free of referrers are in (or behind) a cycle
+        remaining = set(to_delete)
+        while True:
+            free = {g for g in remaining if not self.referrers.get(g, set()) & remaining}
+            if not free:
+                break
+            remaining -= free
+        for group_id in remaining:
+            for referrer in self.referrers.get(group_id, set()) & remaining:
+                revoke.setdefault(referrer, set()).add(group_id)
+        return revoke
+
+    def forget_references(self, referrer, referenced):
+        for group_id in referenced:
+            self.referrers.get(group_id, set()).discard(referrer)
+
+
+def load_sg_graph(group_ids):
+    """Builds the SecurityGroupGraph. Network interfaces are only loaded for the given groups."""
+    graph = SecurityGroupGraph()
+    for page in ec2_client.get_paginator("describe_security_groups").paginate():
+        for group in page["SecurityGroups"]:
+            graph.add_group(group)
+
+    existing = [group_id for group_id in group_ids if group_id in graph.groups]
+    for batch in chunks(existing, 200):
+        pages = ec2_client.get_paginator("describe_network_interfaces").paginate(
+            Filters=[{"Name": "group-id", "Values": batch}])
+        for page in pages:
+            for interface in page["NetworkInterfaces"]:
+                for group in interface.get("Groups", []):
+                    if group["GroupId"] in batch:
+                        graph.interfaces.setdefault(group["GroupId"], []).append(interface["NetworkInterfaceId"])
+
+    print(f"Loaded {len(graph.groups)} Security Groups, "
+          f"{sum(len(interfaces) for interfaces in graph.interfaces.values())} network interfaces use the ones to delete")
+    return graph
+
+
+async def revoke_references_async(engine, graph, referrer, referenced):
+    """Revokes all rules of a group referencing the given groups, with one call per direction."""
+    ingress, egress = graph.rules_referencing(referrer, referenced)
+    if ingress:
+        await engine.call_api(ec2_client, "revoke_security_group_ingress", GroupId=referrer, IpPermissions=ingress)
+    if egress:
+        await engine.call_api(ec2_client, "revoke_security_group_egress", GroupId=referrer, IpPermissions=egress)
+    graph.forget_references(referrer, referenced)
+    print(f"Revoked {len(ingress) + len(egress)} rules of Security Group {referrer} referencing {', '.join(sorted(referenced))}")
+
+
+async def wait_for_interfaces_async(graph, group_id, arn, interface_timeout):
+    """Waits for the network interfaces using a group to go. Returns False, recording the failure, if any stays."""
+    interfaces = graph.interfaces.get(group_id, [])
+    if not interfaces:
+        return True
+    print(f"Security Group {group_id} is used by {len(interfaces)} network interfaces, waiting for them to go")
+    gone = await asyncio.gather(*(asyncio.wrap_future(poller.register(rt_network_interface, interface_id,
+                                                                       timeout=interface_timeout))
+                                  for interface_id in interfaces))
+    if all(gone):
+        return True
+    in_use = [i for i, interface_gone in zip(interfaces, gone) if not interface_gone]
+    journal.failed(arn, f"still used by network interfaces {', '.join(in_use)}")
+    print(f"❌ Security Group {group_id} is still used by {', '.join(in_use)}")
+    return False
+
+
+async def delete_security_group_async(engine, graph, group_id, arn, done):
+    """Deletes a group once every other group being deleted whose rules reference it has been deleted."""
+    deleted = False
+    try:
+        referrers = [done[r] for r in graph.referrers.get(group_id, set()) if r in done]
+        if not all(await asyncio.gather(*referrers)):
+            journal.failed(arn, "referenced by a security group that could not be deleted")
+            print(f"❌ Security Group {group_id} is referenced by a Security Group that could not be deleted")
+            return
+
+        try:
+            await engine.call_api(ec2_client, "delete_security_group", GroupId=group_id)
+        except Exception as e:
+            journal.failed(arn, e)
+            print(f"Error deleting Security Group {group_id}: {e}")
+            return
+        deleted = True
+        journal.deleted(arn)
+        print(f"Deleted Security Group: {group_id}")
+    finally:
+        done[group_id].set_result(deleted)
+
+
+async def delete_security_groups_async(engine, graph, arns_by_id, interface_timeout):
+    # Rules are revoked only once the groups they reference are free of network interfaces:
+    # a group that stays in use is kept, and so is every rule referencing it
+    free = await asyncio.gather(*(wait_for_interfaces_async(graph, group_id, arn, interface_timeout)
+                                  for group_id, arn in arns_by_id.items()))
+    in_use = {group_id for group_id, group_free in zip(arns_by_id, free) if not group_free}
+
+    revoke = graph.references_to_revoke([group_id for group_id in arns_by_id if group_id not in in_use])
+    results = await asyncio.gather(*(revoke_references_async(engine, graph, referrer, referenced)
+                                     for referrer, referenced in revoke.items()), return_exceptions=True)
+    # Groups still referenced by a rule that could not be revoked can't be deleted, and must not be waited for
+    blocked = set()
+    for (referrer, referenced), result in zip(revoke.items(), results):
+        if isinstance(result, Exception):
+            print(f"Error revoking rules of Security Group {referrer}: {result}")
+            blocked |= referenced
+
+    loop = asyncio.get_running_loop()
+    done = {group_id: loop.create_future() for group_id in arns_by_id}
+    for group_id in blocked:
+        journal.failed(arns_by_id[group_id], "referenced by a rule that could not be revoked")
+        print(f"❌ Security Group {group_id} is referenced by a rule that could not be revoked")
+    for group_id in blocked | in_use:
+        done[group_id].set_result(False)
+    await asyncio.gather(*(delete_security_group_async(engine, graph, group_id, arn, done)
+                           for group_id, arn in arns_by_id.items() if group_id not in blocked | in_use))
+
+
+def delete_security_groups(s_groups, concurrency=None, interface_timeout=300):
+    """
+    Deletes security groups in one pass: loads the reference graph once, waits for the network
+    interfaces using them to go, revokes the rules of other groups that reference the groups now
+    free in bulk, then deletes those concurrently, each as soon as the groups referencing it are
+    deleted. Rules referencing a group still in use are left alone.
+    """
+    arns_by_id = {get_id_from_arn(arn): arn for arn in journal.unfinished(s_groups)}
+    if not arns_by_id:
+        return
+    graph = load_sg_graph(list(arns_by_id))
+
+    for group_id in list(arns_by_id):
+        group = graph.groups.get(group_id)
+        if group is None:
+            journal.deleted(arns_by_id.pop(group_id))
+            print(f"Security Group {group_id} no longer exists.")
+        elif group["GroupName"] == "default":
+            journal.failed(arns_by_id.pop(group_id), "default security groups are deleted with their VPC")
+            print(f"❌ Security Group {group_id} is the default group of {group.get('VpcId')} and cannot be deleted")
+
+    journal.requested(list(arns_by_id.values()))
+    engine = AsyncCleanupEngine(concurrency)
+    engine.run([delete_security_groups_async(engine, graph, arns_by_id, interface_timeout)])
+
+
+def interface_detachments(interface):
+    """
+    Returns (detach calls, owner) of a network interface. Secondary interfaces of instances are
+    detached. Primary interfaces and requester-managed ones (load balancers, endpoints, ...)
+    cannot be detached, they are deleted with their owner, which is returned instead.
+    """
+    attachment = interface.get("Attachment")
+    if interface["Status"] == "available" or not attachment:
+        return [], None
+    if interface.get("RequesterManaged") or attachment.get("DeviceIndex") == 0 or not attachment.get("InstanceId"):
+        return [], attachment.get("InstanceId") or interface.get("Description") or interface.get("InterfaceType")
+    return [("detach_network_interface", {"AttachmentId": attachment["AttachmentId"]})], None
+
+
+def volume_detachments(volume):
+    """Returns (detach calls, owner) of a volume: one detach per instance it is attached to."""
+    return [("detach_volume", {"VolumeId": volume["VolumeId"], "InstanceId": attachment["InstanceId"],
+                               "Device": attachment["Device"]})
+            for attachment in volume.get("Attachments", []) if attachment["State"] in ("attaching", "attached")], None
+
+
+# How the bulk engine describes, frees and deletes each storage and network resource type
+BULK_TYPES = {
+    rt_network_interface: {"describe": "describe_network_interfaces", "filter": "network-interface-id",
+                           "key": "NetworkInterfaces", "id": "NetworkInterfaceId", "state": "Status",
+                           "delete": "delete_network_interface", "detachments": interface_detachments},
+    rt_volume: {"describe": "describe_volumes", "filter": "volume-id", "key": "Volumes", "id": "VolumeId",
+                "state": "State", "delete": "delete_volume", "detachments": volume_detachments},
+    rt_snapshot: {"describe": "describe_snapshots", "filter": "snapshot-id", "key": "Snapshots", "id": "SnapshotId",
+                  "state": "State", "delete": "delete_snapshot", "detachments": lambda snapshot: ([], None),
+                  "params": {"OwnerIds": ["self"]}},
+}
+
+
+def describe_bulk_resources(resource_type, resource_ids):
+    """Returns {ID: description} of the resources that still exist, with one filtered describe per 200 IDs."""
+    spec = BULK_TYPES[resource_type]
+    paginator = ec2_client.get_paginator(spec["describe"])
+    found = {}
+    for batch in chunks(resource_ids, 200):
+        pages = paginator.paginate(Filters=[{"Name": spec["filter"], "Values": batch}], **spec.get("params", {}))
+        found.update({item[spec["id"]]: item for page in pages for item in page[spec["key"]]})
+    return found
+
+
+async def delete_bulk_resource_async(engine, resource_type, resource, arn, timeout):
+    """Detaches a resource if needed, deletes it and waits for the shared poller to confirm it is gone."""
+    spec = BULK_TYPES[resource_type]
+    resource_id = resource[spec["id"]]
+    state = resource.get(spec["state"])
+    detachments, owner = spec["detachments"](resource)
+    try:
+        if owner:
+            # Only its owner can free it, it goes away when the owner is deleted
+            print(f"{resource_type} {resource_id} is attached to {owner}, waiting for it to be deleted with it")
+            if await asyncio.wrap_future(poller.register(resource_type, resource_id, timeout=timeout)):
+                journal.deleted(arn)
+            else:
+                journal.failed(arn, f"still attached to {owner}")
+            return
+
+        if state not in ("deleting", "deleted"):
+            for operation, params in detachments:
+                await engine.call_api(ec2_client, operation, **params)
+                print(f"Detaching {resource_type} {resource_id}")
+            if state in ("in-use", "attaching", "detaching"):
+                detached = poller.register(f"{resource_type}:detach", resource_id, timeout=timeout)
+                if not await asyncio.wrap_future(detached):
+                    journal.failed(arn, f"not detached after {timeout}s")
+                    return
+
+            journal.requested(arn)
+            try:
+                await engine.call_api(ec2_client, spec["delete"], **{spec["id"]: resource_id})
+            except Exception as e:
+                if ".NotFound" not in str(e):
+                    raise
+            print(f"Requested deletion of {resource_type} {resource_id}")
+
+        if await asyncio.wrap_future(poller.register(resource_type, resource_id, timeout=timeout)):
+            journal.deleted(arn)
+        else:
+            journal.failed(arn, f"still exists after {timeout}s")
+    except Exception as e:
+        journal.failed(arn, e)
+        print(f"Error deleting {resource_type} {resource_id}: {e}")
+
+
+def delete_in_bulk(resource_type, arns, concurrency=None, timeout=600):
+    """
+    Deletes network interfaces, volumes or snapshots in bulk: checks their state with one multi-ID
+    describe, detaches what can be detached, issues all deletes concurrently under the engine's
+    EC2 concurrency cap, and confirms them through the shared poller with one filtered describe
+    per tick instead of a waiter per resource.
+    """
+    arns_by_id = {get_id_from_arn(arn): arn for arn in journal.unfinished(arns)}
+    if not arns_by_id:
+        return
+    try:
+        existing = describe_bulk_resources(resource_type, list(arns_by_id))
+    except Exception as e:
+        print(f"Error checking {resource_type} resources: {e}")
+        return
+
+    # Resources already gone count as deleted, so the next run doesn't look them up again
+    gone = [arn for resource_id, arn in arns_by_id.items() if resource_id not in existing]
+    if gone:
+        print(f"{len(gone)} {resource_type} resources do not exist or are already deleted")
+        journal.deleted(gone)
+    if not existing:
+        return
+
+    print(f"Deleting {len(existing)} {resource_type} resources...")
+    engine = AsyncCleanupEngine(concurrency)
+    engine.run([delete_bulk_resource_async(engine, resource_type, resource, arns_by_id[resource_id], timeout)
+                for resource_id, resource in existing.items()])
+
+
+def delete_network_interfaces(interfaces, concurrency=None):
+    delete_in_bulk(rt_network_interface, interfaces, concurrency, timeout=150)
+
+
+def delete_volumes(vols, concurrency=None):
+    # Same overall timeout as the volume_deleted waiter
+    delete_in_bulk(rt_volume, vols, concurrency, timeout=600)
+
+
+def delete_snapshots(snapshots, concurrency=None):
+    # Snapshots still used by an AMI fail with InvalidSnapshot.InUse and are recorded as failed
+    delete_in_bulk(rt_snapshot, snapshots, concurrency, timeout=600)
+
+
+def cleanup_region(instances, network_interfaces, volumes, security_groups, snapshots=()):
+    """Deletes the EC2 resources of the current region."""
+    # Delete EC2 resources in proper order(EC2 Instances -> Network Interfaces -> Security Groups -> Volumes -> Snapshots)
+    if bulk_mode:
+        delete_instances_in_bulk(instances)
+    else:
+        delete_instances(instances)
+    delete_network_interfaces(network_interfaces)
+    delete_security_groups(security_groups)
+    delete_volumes(volumes)
+    delete_snapshots(list(snapshots))
+
+
+def main():
+    start_run("cleanup_ec2")
+    # Get ARNs for EC2 resources types which should be deleted.
+    instances = get_ec2_resources_by_tag("tech:team_name", ["team_boss_wireless"], rt_instance)
+    # print(f"BW EC2 instances to delete: {instances}")
+    network_interfaces = get_ec2_resources_by_tag("tech:team_name", ["team_boss_wireless"], rt_network_interface)
+    # print(f"Network Interfaces to delete: {network_interfaces}")
+    volumes = get_ec2_resources_by_tag("tech:team_name", ["team_boss_wireless"], rt_volume)
+    # print(f"Volumes to delete: {volumes}")
+    security_groups = get_ec2_resources_by_tag("tech:team_name", ["team_boss_wireless"], rt_security_group)
+    # print(f"Security Groups to delete: {security_groups}")
+    snapshots = get_ec2_resources_by_tag("tech:team_name", ["team_boss_wireless"], rt_snapshot)
+
+    resources = {"instances": instances, "network_interfaces": network_interfaces,
+                 "volumes": volumes, "security_groups": security_groups, "snapshots": snapshots}
+    by_region = {}
+    for kind, arns in resources.items():
+        for region, region_arns in group_by_region(arns).items():
+            by_region.setdefault(region, dict.fromkeys(resources, []))[kind] = region_arns
+
+    run_in_regions({region: (lambda r=by_region[region]: cleanup_region(**r)) for region in by_region},
+                   label="EC2 cleanup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import asyncio
+
+from async_engine import AsyncCleanupEngine
+from resource_inventory import stream_resources
+from aws_clients import lazy_client
+from aws_regions import delete_streamed
+from run_journal import journal
+from api_metrics import start_run
+
+aws_profile = None  # None uses aws_clients.default_profile
+# Regions to clean, e.g. ["us-east-1", "eu-west-1"], "all" for every enabled region, None for the profile's default
+regions = None
+ecs_client = lazy_client('ecs', aws_profile)
+
+def get_task_definitions_to_delete():
+    """Yields pages of tagged task definitions as the tagging API returns them."""
+    return stream_resources("to_delete", ["yes"], aws_profile, regions, ["ecs:task-definition"])
+
+
+async def deregister_task_definition_async(engine, task, deregistered):
+    """Deregisters one task definition and hands it to the delete batcher."""
+    try:
+        await engine.call_api(ecs_client, "deregister_task_definition", taskDefinition=task)
+        journal.requested(task)
+        await deregistered.put(task)
+    except Exception as e:
+        journal.failed(task, e)
+        print(f"Unable to deregister task %s: {e}" % task)
+
+
+async def delete_task_definition_batch_async(engine, batch):
+    try:
+        response = await engine.call_api(ecs_client, "delete_task_definitions", taskDefinitions=batch)
+        failed = set()
+        for failure in response.get("failures", []):
+            print(f"Failed to delete task definition {failure.get('arn')}: {failure.get('reason')} {failure.get('detail', '')}")
+            journal.failed(failure.get("arn"), f"{failure.get('reason')} {failure.get('detail', '')}")
+            failed.add(failure.get("arn"))
+        journal.deleted([task for task in batch if task not in failed])
+        print(f"Deleted task definitions batch: {batch}")
+    except Exception as e:
+        journal.failed(batch, e)
+        print(f"Error deleting task definitions {batch}: {e}")
+
+
+async def delete_deregistered_in_batches_async(engine, deregistered, batch_size=10, linger=0.5):
+    """
+    Collects deregistered task definitions from the queue and sends a delete_task_definitions
+    call every time 10 are ready, or when no new one arrived for `linger` seconds.
+    Stops after receiving None.
+    """
+    batch = []
+    flushes = []
+    done = False
+    while not done:
+        try:
+            task = await asyncio.wait_for(deregistered.get(), timeout=linger)
+        except asyncio.TimeoutError:
+            task = False  # Nothing new, flush what is collected so far
+
+        if task is None:
+            done = True
+        elif task:
+            batch.append(task)
+
+        if batch and (len(batch) >= batch_size or not task):
+            flushes.append(asyncio.create_task(delete_task_definition_batch_async(engine, batch)))
+            batch = []
+
+    await asyncio.gather(*flushes)
+
+
+async def delete_task_definitions_pipeline(engine, task_defs):
+    deregistered = asyncio.Queue()
+    deleter = asyncio.create_task(delete_deregistered_in_batches_async(engine, deregistered))
+
+    # Task definitions an earlier run deregistered go straight to deletion
+    in_flight = journal.in_flight(task_defs)
+    for task in task_defs:
+        if task in in_flight:
+            await deregistered.put(task)
+
+    try:
+        await asyncio.gather(*(deregister_task_definition_async(engine, task, deregistered)
+                               for task in task_defs if task not in in_flight), return_exceptions=True)
+    finally:
+        # The ones already deregistered are deleted whatever happened to the others
+        await deregistered.put(None)
+        await deleter
+
+
+def delete_task_definitions(task_defs, concurrency=None):
+    """
+    Deregisters the given task definitions (names or ARNs) concurrently and deletes them
+    in batches of 10 as they are deregistered, so the two stages overlap.
+
+    :param concurrency: Per-service concurrency caps, e.g. {"ecs": 20}.
+    """
+    task_defs = journal.unfinished(task_defs)
+    engine = AsyncCleanupEngine(concurrency)
+    engine.run([delete_task_definitions_pipeline(engine, task_defs)])
+
+
+def main():
+    start_run("cleanup_ecs")
+    # Task definitions are deregistered page by page while discovery is still paging
+    total = delete_streamed(delete_task_definitions, get_task_definitions_to_delete())
+    print("ECS tasks definitions to delete: %d" % total)
+    print("Task definitions should be deleted successfully")
+
+
+if __name__ == "__main__":
+    main()
+
+
@@ -0,0 +1,269 @@
+import asyncio
+import threading
+
+from async_engine import AsyncCleanupEngine
+from resource_inventory import get_inventory
+from aws_clients import lazy_client, current_region
+from aws_regions import group_by_region, run_in_regions
+from run_journal import journal
+from api_metrics import start_run
+
+aws_profile = None  # None uses aws_clients.default_profile
+# Regions to clean, e.g. ["us-east-1", "eu-west-1"], "all" for every enabled region, None for the profile's default
+regions = None
+elb_client = lazy_client('elbv2', aws_profile)
+
+def get_lb_to_delete():
+    """
+    Fetches all Load Balancer V2 (ALB/NLB) ARNs that have a specific tag.
+    """
+    load_balancers = []
+    
+    try:
+        inventory = get_inventory("to_delete", ["yes"], aws_profile, regions=regions)
+
+        # Extract Load Balancer ARNs
+        for lb_arn in inventory.resources("elasticloadbalancing:loadbalancer", tag_values=["yes"]):
+            print(f"Load Balancer marked for deletion: {lb_arn}")
+            load_balancers.append(lb_arn)
+
+    except Exception as e:
+        print(f"Error fetching tagged Load Balancers: {e}")
+
+    return load_balancers
+
+
+class LoadBalancerTopology:
+    """
+    In-memory LB -> listener -> target group -> target index, loaded with one paginated
+    describe_load_balancers and describe_target_groups scan plus describe_listeners and
+    describe_target_health calls made in parallel. Deletions are recorded so later
+    steps don't act on resources that are already gone.
+    """
+
+    def __init__(self):
+        self.load_balancers = {}    # LB ARN -> description
+        self.listeners = {}         # LB ARN -> listener ARNs
+        self.target_groups = {}     # TG ARN -> description
+        self.lb_target_groups = {}  # LB ARN -> ARNs of TGs attached to it
+        self.targets = {}           # TG ARN -> target health descriptions
+        self.loaded_for = set()     # ARNs of the LBs whose listeners and targets were loaded
+        self.forgotten = set()      # ARNs of the LBs and TGs deleted in this process
+
+    def is_safe_to_delete(self, load_balancer_arn):
+        """Checks from the index that the LB has no listeners left and its target groups no targets."""
+        if self.listeners.get(load_balancer_arn):
+            print(f"Load Balancer {load_balancer_arn} still has active listeners.")
+            return False
+        for target_group_arn in self.lb_target_groups.get(load_balancer_arn, []):
+            if self.targets.get(target_group_arn):
+                print(f"Target Group {target_group_arn} still has registered targets.")
+                return False
+        print(f"Load Balancer {load_balancer_arn} is safe to delete.")
+        return True
+
+    def forget_load_balancer(self, load_balancer_arn):
+        self.forgotten.add(load_balancer_arn)
+        self.load_balancers.pop(load_balancer_arn, None)
+        self.listeners.pop(load_balancer_arn, None)
+        for target_group_arn in self.lb_target_groups.get(load_balancer_arn, []):
+            attached = self.target_groups.get(target_group_arn, {}).get("LoadBalancerArns", [])
+            if load_balancer_arn in attached:
+                attached.remove(load_balancer_arn)
+
+    def forget_target_group(self, target_group_arn):
+        self.forgotten.add(target_group_arn)
+        self.target_groups.pop(target_group_arn, None)
+        self.targets.pop(target_group_arn, None)
+        for attached in self.lb_target_groups.values():
+            if target_group_arn in attached:
+                attached.remove(target_group_arn)
+
+
+async def load_lb_details_async(engine, topology, load_balancer_arn):
+    def list_listener_arns():
+        pages = elb_client.get_paginator("describe_listeners").paginate(LoadBalancerArn=load_balancer_arn)
+        return [listener["ListenerArn"] for page in pages for listener in page["Listeners"]]
+
+    topology.listeners[load_balancer_arn] = await engine.call("elbv2", list_listener_arns)
+
+    async def load_targets(target_group_arn):
+        response = await engine.call_api(elb_client, "describe_target_health", TargetGroupArn=target_group_arn)
+        topology.targets[target_group_arn] = response.get("TargetHealthDescriptions", [])
+
+    await asyncio.gather(*(load_targets(tg) for tg in topology.lb_target_groups.get(load_balancer_arn, [])))
+
+
+def load_lb_topology(lb_arns, concurrency=None, forgotten=()):
+    """
+    Builds the LoadBalancerTopology. Listeners and target health are only loaded
+    for the given load balancers, which are the ones about to be deleted.
+
+    :param forgotten: ARNs already deleted in this process, carried over from an earlier topology.
+    """
+    topology = LoadBalancerTopology()
+    topology.forgotten = set(forgotten)
+
+    for page in elb_client.get_paginator("describe_load_balancers").paginate():
+        for lb in page["LoadBalancers"]:
+            topology.load_balancers[lb["LoadBalancerArn"]] = lb
+
+    for page in elb_client.get_paginator("describe_target_groups").paginate():
+        for tg in page["TargetGroups"]:
+            topology.target_groups[tg["TargetGroupArn"]] = tg
+            for lb_arn in tg.get("LoadBalancerArns", []):
+                topology.lb_target_groups.setdefault(lb_arn, []).append(tg["TargetGroupArn"])
+
+    topology.loaded_for = set(lb_arns)
+    existing = [lb for lb in lb_arns if lb in topology.load_balancers]
+    engine = AsyncCleanupEngine(concurrency)
+    engine.run(load_lb_details_async(engine, topology, lb) for lb in existing)
+
+    print(f"Loaded {len(topology.load_balancers)} Load Balancers and {len(topology.target_groups)} Target Groups")
+    return topology
+
+
+_topologies = {}
+_topologies_lock = threading.Lock()
+
+
+def get_lb_topology(lb_arns=(), refresh=False, target_group_arns=()):
+    """
+    Returns the topology of the current region loaded earlier in this process, or loads it for
+    the given load balancers. It is loaded again when asked about load balancers it was not loaded
+    for, or target groups it doesn't know, e.g. ones tagged after it was loaded in watch mode.
+    Resources deleted in this process never cause a reload, and a reload keeps the details of
+    the load balancers it was loaded for before.
+    """
+    region = current_region.get()
+    with _topologies_lock:
+        topology = _topologies.get(region)
+        if topology is None:
+            topology = _topologies[region] = load_lb_topology(lb_arns)
+        elif (refresh or not (topology.loaded_for | topology.forgotten).issuperset(lb_arns)
+                or any(tg not in topology.target_groups and tg not in topology.forgotten
+                       for tg in target_group_arns)):
+            lb_arns = (topology.loaded_for - topology.forgotten) | set(lb_arns)
+            topology = _topologies[region] = load_lb_topology(lb_arns, forgotten=topology.forgotten)
+        return topology
+
+
+async def delete_target_group_async(engine, topology, tg_arn):
+    try:
+        await engine.call_api(elb_client, "delete_target_group", TargetGroupArn=tg_arn)
+        topology.forget_target_group(tg_arn)
+        journal.deleted(tg_arn)
+        print(f"Deleted Target Group: {tg_arn}")
+    except Exception as e:
+        journal.failed(tg_arn, e)
+        print(f"Error deleting Target Group {tg_arn}: {e}")
+
+
+async def delete_listeners_async(engine, topology, lb):
+    async def delete_listener(listener_arn):
+        await engine.call_api(elb_client, "delete_listener", ListenerArn=listener_arn)
+        print(f"Deleted Listener: {listener_arn}")
+
+    listener_arns = topology.listeners.get(lb, [])
+    results = await asyncio.gather(*(delete_listener(l) for l in listener_arns), return_exceptions=True)
+    for listener_arn, result in zip(listener_arns, results):
+        if isinstance(result, Exception):
+            print(f"Error deleting listener {listener_arn} of Load Balancer {lb}: {result}")
+    topology.listeners[lb] = [l for l, result in zip(listener_arns, results) if isinstance(result, Exception)]
+
+
+async def delete_lb_async(engine, topology, lb):
+    if lb not in topology.load_balancers:
+        journal.deleted(lb)
+        print(f"Load Balancer {lb} does not exist.")
+        return
+
+    can_delete = topology.is_safe_to_delete(lb)
+    print("Load balancer: %s can be deleted: %r" % (lb, can_delete))
+    if can_delete == False:
+        await delete_listeners_async(engine, topology, lb)
+
+    target_group_arns = list(topology.lb_target_groups.get(lb, []))
+    try:
+        await engine.call_api(elb_client, "delete_load_balancer", LoadBalancerArn=lb)
+    except Exception as e:
+        journal.failed(lb, e)
+        print(f"Error deleting Load Balancer {lb}: {e}")
+        return
+    topology.forget_load_balancer(lb)
+    journal.deleted(lb)
+    print(f"Deleted Load Balancer: {lb}")
+
+    # Delete target groups attached to LB:
+    await asyncio.gather(*(delete_target_group_async(engine, topology, tg) for tg in target_group_arns))
+
+
+def delete_target_groups(target_group_arns, concurrency=None):
+    """Deletes the given Target Groups in parallel."""
+    target_group_arns = journal.unfinished(target_group_arns)
+    topology = get_lb_topology(target_group_arns=target_group_arns)
+    existing = [tg for tg in target_group_arns if tg in topology.target_groups]
+    for tg in set(target_group_arns) - set(existing):
+        journal.deleted(tg)
+        print(f"Target Group {tg} no longer exists.")
+    engine = AsyncCleanupEngine(concurrency)
+    engine.run(delete_target_group_async(engine, topology, tg) for tg in existing)
+
+
+def delete_listeners(bw_lbs, concurrency=None):
+    """Deletes all listeners of the given Load Balancers in parallel."""
+    bw_lbs = journal.unfinished(bw_lbs)
+    topology = get_lb_topology(bw_lbs)
+    engine = AsyncCleanupEngine(concurrency)
+    engine.run(delete_listeners_async(engine, topology, lb) for lb in bw_lbs)
+
+
+def delete_lbs(bw_lbs, concurrency=None):
+    """Deletes the given Load Balancers in parallel, with their listeners and attached Target Groups."""
+    bw_lbs = journal.unfinished(bw_lbs)
+    topology = get_lb_topology(bw_lbs)
+    engine = AsyncCleanupEngine(concurrency)
+    engine.run(delete_lb_async(engine, topology, lb) for lb in bw_lbs)
+
+
+def get_lb_target_groups_by_tag(tag_key, tag_value):
+    
+    target_groups = []
+    
+    try:
+        inventory = get_inventory(tag_key, [tag_value], aws_profile, regions=regions)
+
+        # Extract Target Group ARNs
+        for tg_arn in inventory.resources("elasticloadbalancing:targetgroup", tag_values=[tag_value]):
+            print(f"Target Group marked for deletion: {tg_arn}")
+            target_groups.append(tg_arn)
+
+    except Exception as e:
+        print(f"Error fetching tagged Target Groups: {e}")
+
+    return target_groups
+
+tag_key = "to_delete"
+tag_value = "yes"
+
+def cleanup_region(bw_lbs, target_groups_to_delete):
+    """Deletes the Load Balancers and Target Groups of the current region."""
+    get_lb_topology(bw_lbs, refresh=True)
+
+    # Target groups are deleted after the load balancers whose listeners still use them
+    delete_lbs(bw_lbs)
+    delete_target_groups(target_groups_to_delete)
+
+
+def main():
+    start_run("cleanup_lb")
+    bw_lbs = group_by_region(get_lb_to_delete())
+    target_groups_to_delete = group_by_region(get_lb_target_groups_by_tag(tag_key, tag_value))
+
+    run_in_regions({region: (lambda r=region: cleanup_region(bw_lbs.get(r, []), target_groups_to_delete.get(r, [])))
+                    for region in {**bw_lbs, **target_groups_to_delete}}, label="Load Balancer cleanup")
+
+
+if __name__ == "__main__":
+    main()
+
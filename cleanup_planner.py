@@ -0,0 +1,268 @@
+import argparse
+import csv
+import math
+
+from async_engine import SERVICE_CONCURRENCY, DEFAULT_CONCURRENCY
+from aws_clients import get_client
+from cleanup_scheduler import DELETION_STEPS, INVENTORY_TYPES
+from resource_inventory import ResourceInventory, get_resource_type
+from resource_record import get_resource
+from status_poller import (chunks, security_group_checker, network_interface_checker, volume_checker,
+                           snapshot_checker, alarm_checker)
+
+csv_files = ["IDT-QA-BW-resources.csv", "IDT-Prod-BW-resources.csv"]
+tag_key = "tech:team_name"
+
+# Tag Editor (Service, Type) -> ARN template
+CSV_ARN_FORMATS = {
+    ("S3", "Bucket"): "arn:aws:s3:::{id}",
+    ("SQS", "Queue"): "arn:aws:sqs:{region}:{account}:{id}",
+    ("EC2", "Instance"): "arn:aws:ec2:{region}:{account}:instance/{id}",
+    ("EC2", "NetworkInterface"): "arn:aws:ec2:{region}:{account}:network-interface/{id}",
+    ("EC2", "SecurityGroup"): "arn:aws:ec2:{region}:{account}:security-group/{id}",
+    ("EC2", "Snapshot"): "arn:aws:ec2:{region}::snapshot/{id}",
+    ("EC2", "Volume"): "arn:aws:ec2:{region}:{account}:volume/{id}",
+    ("ECS", "Cluster"): "arn:aws:ecs:{region}:{account}:cluster/{id}",
+    ("ECS", "TaskDefinition"): "arn:aws:ecs:{region}:{account}:task-definition/{id}",
+    ("ElasticLoadBalancingV2", "LoadBalancer"): "arn:aws:elasticloadbalancing:{region}:{account}:loadbalancer/{id}",
+    ("ElasticLoadBalancingV2", "TargetGroup"): "arn:aws:elasticloadbalancing:{region}:{account}:targetgroup/{id}",
+    ("CloudWatch", "Alarm"): "arn:aws:cloudwatch:{region}:{account}:alarm:{id}",
+    ("Lambda", "Function"): "arn:aws:lambda:{region}:{account}:function:{id}",
+    ("CloudFront", "Distribution"): "arn:aws:cloudfront::{account}:distribution/{id}",
+}
+
+# Rough cost model of each deletion step as the cleanup modules implement it:
+# (IDs per batched call, calls per batch, calls per resource, seconds spent waiting, seconds between polls)
+STEP_COSTS = {
+    "ec2:instance": (200, 2, 0, 180, 15),
+    "ec2:network-interface": (200, 1, 1, 5, 5),
+    "ec2:volume": (200, 1, 1, 30, 15),
+    "ec2:snapshot": (200, 1, 1, 5, 5),
+    "ec2:security-group": (200, 2, 1, 0, 0),
+    "elasticloadbalancing:listener": (1, 0, 3, 0, 0),
+    "elasticloadbalancing:loadbalancer": (400, 2, 3, 0, 0),
+    "elasticloadbalancing:targetgroup": (1, 0, 1, 0, 0),
+    "ecs:task-definition": (10, 1, 1, 0, 0),
+    "s3": (1, 0, 6, 0, 0),
+    "sqs:queue": (1000, 1, 1, 60, 5),
+    "cloudwatch:alarm": (100, 2, 0, 5, 5),
+    "cloudfront:distribution": (1000, 1, 4, 900, 20),
+}
+
+STEP_SERVICES = {"ec2": "ec2", "elasticloadbalancing": "elbv2", "ecs": "ecs", "s3": "s3", "sqs": "sqs",
+                 "cloudwatch": "cloudwatch", "cloudfront": "cloudfront"}
+
+# Average API call latency used to turn call counts into time
+CALL_LATENCY = 0.2
+
+
+def load_tag_editor_csv(paths, account_id="000000000000", tag_values=None):
+    """
+    Loads Tag Editor CSV exports into a ResourceInventory, the same index the cleanup scripts
+    query. Tag Editor exports contain identifiers instead of ARNs, so ARNs are rebuilt with
+    the given account ID. Every "Tag: <key>" column becomes a tag of the resource.
+    Only resources whose tag_key has one of `tag_values` are loaded, all of them when None.
+    """
+    mappings = []
+    values = set()
+    for path in paths:
+        with open(path, newline="", encoding="utf-8-sig") as csv_file:
+            for row in csv.DictReader(csv_file):
+                arn_format = CSV_ARN_FORMATS.get((row["Service"], row["Type"]))
+                if arn_format is None:
+                    print(f"⚠️ Skipping {row['Service']} {row['Type']} {row['Identifier']}: unknown resource type")
+                    continue
+                arn = arn_format.format(id=row["Identifier"], region=row["Region"], account=account_id)
+                tags = [{"Key": column[len("Tag: "):], "Value": value}
+                        for column, value in row.items() if column.startswith("Tag: ") and value]
+                if tag_values is not None and row.get(f"Tag: {tag_key}") not in tag_values:
+                    continue
+                mappings.append({"ResourceARN": arn, "Tags": tags})
+                values.update(t["Value"] for t in tags if t["Key"] == tag_key)
+
+    print(f"Loaded {len(mappings)} resources from {', '.join(paths)}")
+    return ResourceInventory(tag_key, tag_values or sorted(values), mappings)
+
+
+def estimate_step(resource_type, count):
+    """Returns (estimated API calls, estimated seconds) of a deletion step for `count` resources."""
+    batch_size, calls_per_batch, calls_per_resource, wait, interval = STEP_COSTS[resource_type]
+    calls = math.ceil(count / batch_size) * calls_per_batch + count * calls_per_resource
+    if interval:
+        calls += math.ceil(wait / interval) * math.ceil(count / batch_size)
+
+    service = STEP_SERVICES[resource_type.split(":")[0]]
+    concurrency = SERVICE_CONCURRENCY.get(service, DEFAULT_CONCURRENCY)
+    return calls, wait + calls * CALL_LATENCY / concurrency
+
+
+def build_plan(inventory):
+    """
+    Builds a dry-run deletion plan from an inventory without calling AWS.
+    Returns (steps, unhandled) where steps maps each scheduler step to
+    (resource count, estimated calls, estimated seconds, estimated finish time on the critical path)
+    and unhandled maps resource types no cleanup module deletes to their count.
+    """
+    steps = {}
+    handled = set()
+    for resource_type, _, _, depends_on in DELETION_STEPS:
+        arns = inventory.resources(INVENTORY_TYPES.get(resource_type, resource_type))
+        if not arns:
+            continue
+        handled.update(arns)
+        calls, seconds = estimate_step(resource_type, len(arns))
+        start = max([steps[dep][3] for dep in depends_on if dep in steps], default=0)
+        steps[resource_type] = (len(arns), calls, seconds, start + seconds)
+
+    unhandled = {}
+    for arn in inventory.resources():
+        if arn not in handled:
+            resource_type = get_resource_type(arn)
+            unhandled[resource_type] = unhandled.get(resource_type, 0) + 1
+    return steps, unhandled
+
+
+def print_plan(inventory):
+    steps, unhandled = build_plan(inventory)
+
+    print(f"\nDeletion plan for {inventory.tag_key} in {inventory.tag_values}:")
+    print(f"{'Step':<36}{'Resources':>10}{'API calls':>11}{'Seconds':>9}{'Done at':>9}")
+    for resource_type, (count, calls, seconds, finish) in steps.items():
+        print(f"{resource_type:<36}{count:>10}{calls:>11}{seconds:>9.0f}{finish:>9.0f}")
+
+    total_calls = sum(step[1] for step in steps.values())
+    critical_path = max([step[3] for step in steps.values()], default=0)
+    # Steps overlap, e.g. listeners are deleted through the load balancers, so count each resource once
+    handled = len(inventory.resources()) - sum(unhandled.values())
+    print(f"Total: {handled} resources, ~{total_calls} API calls, "
+          f"~{critical_path / 60:.1f} minutes when independent steps run in parallel")
+
+    for resource_type, count in sorted(unhandled.items()):
+        print(f"⚠️ No cleanup step for {resource_type}: {count} resources will be left")
+    return steps, unhandled
+
+
+def _resource_id(arn):
+    """Returns the plain ID or name of a resource, e.g. i-0123..., a bucket name or an alarm name."""
+    return get_resource(arn).id
+
+
+def _existing_instances(ec2_client, instance_ids):
+    pages = ec2_client.get_paginator("describe_instances").paginate(
+        Filters=[{"Name": "instance-id", "Values": instance_ids}])
+    return {i["InstanceId"] for page in pages for r in page["Reservations"] for i in r["Instances"]
+            if i["State"]["Name"] != "terminated"}
+
+
+def _existing_task_definitions(ecs_client, arns):
+    existing = set()
+    for status in ["ACTIVE", "INACTIVE"]:
+        for page in ecs_client.get_paginator("list_task_definitions").paginate(status=status):
+            existing.update(page["taskDefinitionArns"])
+    return existing & set(arns)
+
+
+def _existing_clusters(ecs_client, names):
+    response = ecs_client.describe_clusters(clusters=names)
+    return {c["clusterName"] for c in response["clusters"] if c["status"] != "INACTIVE"}
+
+
+def _existing_elb(elb_client, arns, operation, key, field):
+    pages = elb_client.get_paginator(operation).paginate()
+    return {item[field] for page in pages for item in page[key]} & set(arns)
+
+
+def _existing_queues(sqs_client, names):
+    pages = sqs_client.get_paginator("list_queues").paginate(PaginationConfig={"PageSize": 1000})
+    return {url.split("/")[-1] for page in pages for url in page.get("QueueUrls", [])} & set(names)
+
+
+def _existing_buckets(s3_client, names):
+    return {b["Name"] for b in s3_client.list_buckets()["Buckets"]} & set(names)
+
+
+def _existing_functions(lambda_client, names):
+    pages = lambda_client.get_paginator("list_functions").paginate()
+    return {f["FunctionName"] for page in pages for f in page["Functions"]} & set(names)
+
+
+def _existing_distributions(cloudfront_client, ids):
+    pages = cloudfront_client.get_paginator("list_distributions").paginate()
+    return {d["Id"] for page in pages for d in page["DistributionList"].get("Items", [])} & set(ids)
+
+
+# Resource type -> (client service, batch size, uses ARNs instead of IDs, function(client, batch) -> existing)
+EXISTENCE_CHECKS = {
+    "ec2:instance": ("ec2", 200, False, _existing_instances),
+    "ec2:network-interface": ("ec2", 200, False, lambda c, ids: network_interface_checker(c)(ids)),
+    "ec2:security-group": ("ec2", 200, False, lambda c, ids: security_group_checker(c)(ids)),
+    "ec2:volume": ("ec2", 200, False, lambda c, ids: volume_checker(c)(ids)),
+    "ec2:snapshot": ("ec2", 200, False, lambda c, ids: snapshot_checker(c)(ids)),
+    "ecs:task-definition": ("ecs", 100000, True, _existing_task_definitions),
+    "ecs:cluster": ("ecs", 100, False, _existing_clusters),
+    "elasticloadbalancing:loadbalancer": ("elbv2", 100000, True,
+                                          lambda c, arns: _existing_elb(c, arns, "describe_load_balancers", "LoadBalancers", "LoadBalancerArn")),
+    "elasticloadbalancing:targetgroup": ("elbv2", 100000, True,
+                                         lambda c, arns: _existing_elb(c, arns, "describe_target_groups", "TargetGroups", "TargetGroupArn")),
+    "sqs:queue": ("sqs", 100000, False, _existing_queues),
+    "s3:bucket": ("s3", 100000, False, _existing_buckets),
+    "cloudwatch:alarm": ("cloudwatch", 100, False, lambda c, names: alarm_checker(c)(names)),
+    "lambda:function": ("lambda", 100000, False, _existing_functions),
+    "cloudfront:distribution": ("cloudfront", 100000, False, _existing_distributions),
+}
+
+
+def verify_plan(inventory, aws_profile):
+    """
+    Checks which planned resources still exist, using only batched describe/list calls
+    per resource type and region. Returns {resource type: (planned, still existing)}.
+    """
+    account_id = get_client("sts", aws_profile).get_caller_identity()["Account"]
+    results = {}
+
+    for resource_type in sorted(inventory.resource_types()):
+        arns = inventory.resources(resource_type)
+        if resource_type not in EXISTENCE_CHECKS:
+            print(f"⚠️ Cannot verify {resource_type}: no existence check")
+            continue
+        service, batch_size, uses_arns, check = EXISTENCE_CHECKS[resource_type]
+
+        by_region = {}
+        for arn in arns:
+            # ARNs rebuilt from a CSV carry a placeholder account
+            parts = arn.split(":", 5)
+            if parts[4]:
+                parts[4] = account_id
+            by_region.setdefault(parts[3] or None, []).append(":".join(parts))
+
+        existing = 0
+        for region, region_arns in by_region.items():
+            client = get_client(service, aws_profile, region)
+            keys = region_arns if uses_arns else [_resource_id(arn) for arn in region_arns]
+            for batch in chunks(keys, batch_size):
+                existing += len(check(client, batch))
+
+        results[resource_type] = (len(arns), existing)
+        print(f"{resource_type:<36} planned {len(arns):>5}, still existing {existing:>5}")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan a cleanup from Tag Editor CSV exports without calling AWS.")
+    parser.add_argument("csv", nargs="*", default=csv_files, help="Tag Editor CSV exports")
+    parser.add_argument("--tag-values", nargs="+", help=f"Only plan resources with these {tag_key} values")
+    parser.add_argument("--account-id", default="000000000000", help="Account ID used to rebuild ARNs")
+    parser.add_argument("--verify", metavar="PROFILE", help="Check the plan against live state in this AWS profile")
+    args = parser.parse_args()
+
+    inventory = load_tag_editor_csv(args.csv, args.account_id, args.tag_values)
+
+    print_plan(inventory)
+    if args.verify:
+        print(f"\nVerifying plan against profile {args.verify}:")
+        verify_plan(inventory, args.verify)
+
+
+if __name__ == "__main__":
+    main()
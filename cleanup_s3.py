@@ -0,0 +1,279 @@
+import contextvars
+import queue
+import threading
+from datetime import datetime, timedelta, timezone
+from botocore.exceptions import ClientError
+
+from resource_inventory import stream_resources
+from aws_regions import delete_streamed
+from resource_record import get_resource
+from aws_clients import lazy_client, using_region
+from run_journal import journal
+from api_metrics import start_run
+
+aws_profile = None  # None uses aws_clients.default_profile
+# Regions to clean, e.g. ["us-east-1", "eu-west-1"], "all" for every enabled region, None for the profile's default
+regions = None
+s3_client = lazy_client('s3', aws_profile)
+cloudwatch_client = lazy_client('cloudwatch', aws_profile)
+
+# Buckets too large to empty with delete_objects are expired by an S3 lifecycle rule instead
+lifecycle_buckets = ["bosswireless-prod-usage-import"]
+lifecycle_object_threshold = 1000000
+lifecycle_rule_id = "bw-cleanup-expire-everything"
+
+def get_buckets_to_delete():
+    """Yields pages of tagged buckets as the tagging API returns them."""
+    return stream_resources("to_delete", ["yes"], aws_profile, regions, ["s3"])
+
+def list_delete_batches(bucket_name, batch_size=1000):
+    """
+    Yields batches of up to 1000 {"Key", "VersionId"} entries covering every object,
+    object version and delete marker in the bucket, following the continuation markers.
+    """
+    versioning_status = s3_client.get_bucket_versioning(Bucket=bucket_name).get("Status")
+
+    if versioning_status in ["Enabled", "Suspended"]:
+        print(f"Bucket {bucket_name} has versioning {versioning_status}. Deleting all object versions and delete markers.")
+        paginator = s3_client.get_paginator("list_object_versions")
+        for page in paginator.paginate(Bucket=bucket_name, PaginationConfig={"PageSize": batch_size}):
+            delete_keys = [{"Key": v["Key"], "VersionId": v["VersionId"]} for v in page.get("Versions", [])]
+            delete_keys.extend({"Key": dm["Key"], "VersionId": dm["VersionId"]} for dm in page.get("DeleteMarkers", []))
+            for i in range(0, len(delete_keys), batch_size):
+                yield delete_keys[i:i + batch_size]
+    else:
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, PaginationConfig={"PageSize": batch_size}):
+            delete_keys = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+            if delete_keys:
+                yield delete_keys
+
+
+def empty_bucket(bucket_name, workers=8, queue_size=16):
+    """
+    Fully empty an S3 bucket, including all versions and delete markers.
+
+    Listing pages are streamed through a bounded queue to a pool of workers, each sending
+    1000-key delete_objects batches, so memory stays flat regardless of the bucket size.
+
+    :param bucket_name: The name of the bucket to empty.
+    :param workers: Number of threads sending delete_objects requests.
+    :param queue_size: Maximum number of listed batches waiting for a worker.
+    """
+    print(f"Emptying bucket: {bucket_name}")
+
+    batches = queue.Queue(maxsize=queue_size)
+    counter_lock = threading.Lock()
+    totals = {"batches": 0, "deleted": 0, "errors": 0, "listed": True}
+
+    def delete_worker():
+        while True:
+            batch = batches.get()
+            if batch is None:
+                return
+            try:
+                response = s3_client.delete_objects(Bucket=bucket_name, Delete={"Objects": batch, "Quiet": True})
+                errors = response.get("Errors", [])
+                for error in errors[:5]:
+                    print(f"Error deleting {error.get('Key')} from {bucket_name}: {error.get('Code')} {error.get('Message')}")
+            except Exception as e:
+                # Connection errors and timeouts after retries too: a dead worker would leave the queue full
+                print(f"Error deleting {len(batch)} objects from {bucket_name}: {e}")
+                errors = batch
+
+            with counter_lock:
+                totals["batches"] += 1
+                totals["deleted"] += len(batch) - len(errors)
+                totals["errors"] += len(errors)
+                if totals["batches"] % 100 == 0:
+                    print(f"Deleted {totals['deleted']} objects from {bucket_name} so far")
+
+    # Workers run in a copy of the caller's context, so they use the caller's region
+    threads = [threading.Thread(target=contextvars.copy_context().run, args=(delete_worker,), daemon=True)
+               for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for batch in list_delete_batches(bucket_name):
+            batches.put(batch)  # Blocks while workers are behind, keeping memory bounded
+    except Exception as e:
+        print(f"Error emptying bucket {bucket_name}: {e}")
+        totals["listed"] = False
+    finally:
+        for _ in threads:
+            batches.put(None)
+        for thread in threads:
+            thread.join()
+
+    print(f"Deleted {totals['deleted']} objects/versions from {bucket_name} ({totals['errors']} failed)")
+    return totals["errors"] == 0 and totals["listed"]
+
+def get_bucket_arn(bucket_name):
+    return f"arn:aws:s3:::{bucket_name}"
+
+def delete_bucket(bucket_name):
+    try:
+        s3_client.delete_bucket(Bucket=bucket_name)
+        journal.deleted(get_bucket_arn(bucket_name))
+        print(f"Deleted bucket: {bucket_name}")
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NoSuchBucket":
+            journal.deleted(get_bucket_arn(bucket_name))
+        else:
+            journal.failed(get_bucket_arn(bucket_name), e)
+        print(f"Error deleting bucket {bucket_name}: {e}")
+
+def get_bucket_region(bucket_name):
+    """Returns the region a bucket lives in. Buckets in us-east-1 have no location constraint."""
+    location = s3_client.get_bucket_location(Bucket=bucket_name).get("LocationConstraint")
+    return {None: "us-east-1", "": "us-east-1", "EU": "eu-west-1"}.get(location, location)
+
+
+def get_bucket_object_count(bucket_name):
+    """
+    Returns the latest daily NumberOfObjects CloudWatch metric of a bucket, or None if unknown.
+    S3 publishes the metric in the bucket's own region, which is where it is read.
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        with using_region(get_bucket_region(bucket_name)):
+            response = cloudwatch_client.get_metric_statistics(
+                Namespace="AWS/S3",
+                MetricName="NumberOfObjects",
+                Dimensions=[
+                    {"Name": "BucketName", "Value": bucket_name},
+                    {"Name": "StorageType", "Value": "AllStorageTypes"},
+                ],
+                StartTime=now - timedelta(days=3),
+                EndTime=now,
+                Period=86400,
+                Statistics=["Average"],
+            )
+    except ClientError as e:
+        print(f"Unable to get object count of bucket {bucket_name}: {e}")
+        return None
+
+    datapoints = sorted(response["Datapoints"], key=lambda dp: dp["Timestamp"])
+    return int(datapoints[-1]["Average"]) if datapoints else None
+
+
+def has_expiry_lifecycle(bucket_name):
+    """Checks whether the expire-everything lifecycle rule is already set on the bucket."""
+    try:
+        rules = s3_client.get_bucket_lifecycle_configuration(Bucket=bucket_name)["Rules"]
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NoSuchLifecycleConfiguration":
+            return False
+        raise
+    return any(rule.get("ID") == lifecycle_rule_id for rule in rules)
+
+
+def use_lifecycle_expiry(bucket_name):
+    """Decides whether a bucket is too large to be emptied with delete_objects calls."""
+    if bucket_name in lifecycle_buckets:
+        return True
+    object_count = get_bucket_object_count(bucket_name)
+    if object_count is not None:
+        print(f"Bucket {bucket_name} holds about {object_count} objects")
+    return object_count is not None and object_count >= lifecycle_object_threshold
+
+
+def put_expiry_lifecycle(bucket_name):
+    """
+    Replaces the bucket lifecycle configuration with rules expiring current versions,
+    noncurrent versions, expired delete markers and incomplete multipart uploads.
+    """
+    s3_client.put_bucket_lifecycle_configuration(
+        Bucket=bucket_name,
+        LifecycleConfiguration={"Rules": [
+            {
+                "ID": lifecycle_rule_id,
+                "Filter": {"Prefix": ""},
+                "Status": "Enabled",
+                "Expiration": {"Days": 1},
+                "NoncurrentVersionExpiration": {"NoncurrentDays": 1},
+                "AbortIncompleteMultipartUpload": {"DaysAfterInitiation": 1},
+            },
+            {
+                # ExpiredObjectDeleteMarker cannot be combined with Days in one Expiration
+                "ID": f"{lifecycle_rule_id}-delete-markers",
+                "Filter": {"Prefix": ""},
+                "Status": "Enabled",
+                "Expiration": {"ExpiredObjectDeleteMarker": True},
+            },
+        ]},
+    )
+    print(f"Put expire-everything lifecycle configuration on bucket {bucket_name}")
+
+
+def is_bucket_empty(bucket_name):
+    """Checks with two single-item list calls whether a bucket has no objects, versions or uploads left."""
+    versions = s3_client.list_object_versions(Bucket=bucket_name, MaxKeys=1)
+    if versions.get("Versions") or versions.get("DeleteMarkers"):
+        return False
+    uploads = s3_client.list_multipart_uploads(Bucket=bucket_name, MaxUploads=1)
+    return not uploads.get("Uploads")
+
+
+def expire_bucket(bucket_name):
+    """
+    Lets S3 lifecycle expiry empty a bucket. The first run puts the lifecycle rule,
+    later runs check whether the bucket has drained and delete it once it has.
+
+    :return: True if the bucket was deleted on this run.
+    """
+    try:
+        if not has_expiry_lifecycle(bucket_name):
+            put_expiry_lifecycle(bucket_name)
+            journal.requested(get_bucket_arn(bucket_name))
+            print(f"Bucket {bucket_name} will be deleted on a later run once lifecycle expiry empties it")
+            return False
+
+        if not is_bucket_empty(bucket_name):
+            print(f"Bucket {bucket_name} is still being emptied by lifecycle expiry. Skipping for now.")
+            return False
+
+    except ClientError as e:
+        journal.failed(get_bucket_arn(bucket_name), e)
+        print(f"Error expiring bucket {bucket_name}: {e}")
+        return False
+
+    delete_bucket(bucket_name)
+    return True
+
+
+def cleanup_bucket(bucket_name):
+    """Deletes a bucket, expiring it with a lifecycle rule if it is too large to empty directly."""
+    try:
+        lifecycle_mode = has_expiry_lifecycle(bucket_name) or use_lifecycle_expiry(bucket_name)
+    except ClientError as e:
+        print(f"Error checking lifecycle configuration of bucket {bucket_name}: {e}")
+        return
+
+    if lifecycle_mode:
+        expire_bucket(bucket_name)
+    elif empty_bucket(bucket_name):
+        delete_bucket(bucket_name)
+    else:
+        journal.failed(get_bucket_arn(bucket_name), "objects left after emptying the bucket")
+        print(f"❌ Bucket {bucket_name} could not be emptied, not deleting it")
+
+def delete_buckets(bucket_arns):
+    """Deletes the buckets with the given ARNs."""
+    for bucket_arn in journal.unfinished(bucket_arns):
+        cleanup_bucket(get_resource(bucket_arn).id)
+
+
+def main():
+    start_run("cleanup_s3")
+    # Buckets are emptied and deleted page by page while discovery is still paging
+    total = delete_streamed(delete_buckets, get_buckets_to_delete())
+    print(f"Buckets marked for deletion: {total}")
+
+    print("S3 cleanup completed!")
+
+
+if __name__ == "__main__":
+    main()
+ 
\ No newline at end of file
@@ -0,0 +1,163 @@
+import concurrent.futures
+import importlib
+import time
+
+from aws_regions import delete_in_regions
+from resource_inventory import get_inventory
+from run_journal import journal
+from api_metrics import start_run
+
+tag_key = "to_delete"
+tag_values = ["yes"]
+aws_profile = None  # None uses aws_clients.default_profile
+# Regions to clean, e.g. ["us-east-1", "eu-west-1"], "all" for every enabled region, None for the profile's default
+regions = None
+
+# (resource type, cleanup module, delete function taking a list of ARNs, resource types deleted first)
+DELETION_STEPS = [
+    ("ec2:instance", "cleanup_ec2", "delete_instances_in_bulk", []),
+    ("ec2:network-interface", "cleanup_ec2", "delete_network_interfaces",
+     ["ec2:instance", "elasticloadbalancing:loadbalancer"]),
+    ("ec2:volume", "cleanup_ec2", "delete_volumes", ["ec2:instance"]),
+    ("ec2:snapshot", "cleanup_ec2", "delete_snapshots", []),
+    ("ec2:security-group", "cleanup_ec2", "delete_security_groups",
+     ["ec2:instance", "ec2:network-interface", "elasticloadbalancing:loadbalancer"]),
+    ("elasticloadbalancing:listener", "cleanup_lb", "delete_listeners", []),
+    ("elasticloadbalancing:loadbalancer", "cleanup_lb", "delete_lbs", ["elasticloadbalancing:listener"]),
+    ("elasticloadbalancing:targetgroup", "cleanup_lb", "delete_target_groups",
+     ["elasticloadbalancing:listener", "elasticloadbalancing:loadbalancer"]),
+    ("ecs:task-definition", "cleanup_ecs", "delete_task_definitions", []),
+    ("s3", "cleanup_s3", "delete_buckets", []),
+    ("sqs:queue", "cleanup_sqs", "delete_sqs_queues", []),
+    ("cloudwatch:alarm", "cleanup_cloudwatch", "delete_cloudwatch_alarms", []),
+    ("cloudfront:distribution", "cleanup_cloudfront", "delete_cloudfront_distributions", []),
+]
+
+# Listeners are not tagged themselves, they are deleted through the tagged load balancers
+INVENTORY_TYPES = {"elasticloadbalancing:listener": "elasticloadbalancing:loadbalancer"}
+
+
+class DeletionScheduler:
+    """
+    Runs deletion steps concurrently, starting each step as soon as all the steps
+    it depends on have finished. A failed step does not block its dependents,
+    the same way the serial scripts carry on after printing an error.
+    """
+
+    def __init__(self, max_workers=16):
+        self.max_workers = max_workers
+        self.steps = {}
+
+    def add(self, name, action, depends_on=()):
+        """Registers a step. Dependencies on steps that are never added are ignored."""
+        self.steps[name] = (action, list(depends_on))
+
+    def _dependencies(self):
+        dependencies = {name: {dep for dep in deps if dep in self.steps} for name, (_, deps) in self.steps.items()}
+
+        # Kahn's algorithm to reject cycles before anything is deleted
+        remaining = {name: set(deps) for name, deps in dependencies.items()}
+        ready = [name for name, deps in remaining.items() if not deps]
+        visited = 0
+        while ready:
+            done = ready.pop()
+            visited += 1
+            for name, deps in remaining.items():
+                if done in deps:
+                    deps.discard(done)
+                    if not deps:
+                        ready.append(name)
+        if visited != len(remaining):
+            raise ValueError("Deletion steps have a dependency cycle")
+
+        return dependencies
+
+    def run(self):
+        """
+        Runs all steps and returns a dict of step name -> (status, duration in seconds).
+        """
+        dependencies = self._dependencies()
+        results = {}
+        started = {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+
+            def submit_ready():
+                for name, deps in dependencies.items():
+                    if name not in started and not deps - set(results):
+                        print(f"▶️ Starting step {name}")
+                        started[name] = time.monotonic()
+                        running[executor.submit(self.steps[name][0])] = name
+
+            submit_ready()
+            while running:
+                finished, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    duration = time.monotonic() - started[name]
+                    try:
+                        future.result()
+                        results[name] = ("done", duration)
+                        print(f"✅ Step {name} finished in {duration:.1f}s")
+                    except Exception as e:
+                        results[name] = ("failed", duration)
+                        print(f"❌ Step {name} failed after {duration:.1f}s: {e}")
+                submit_ready()
+
+        return results
+
+
+def run_step_in_regions(delete_function, arns):
+    """Runs a step on every region's resources concurrently, failing the step if any region failed."""
+    results = delete_in_regions(delete_function, arns)
+    failed = [region or "default region" for region, result in results.items() if isinstance(result, Exception)]
+    if failed:
+        raise RuntimeError(f"failed in {', '.join(failed)}")
+
+
+def build_cleanup_graph(inventory, max_workers=16):
+    """
+    Builds a scheduler with one step per resource type that has tagged resources.
+    Cleanup modules are imported only for the resource types that are present.
+    Each step works on all regions at once, one thread per region.
+    """
+    scheduler = DeletionScheduler(max_workers=max_workers)
+
+    for resource_type, module_name, function_name, depends_on in DELETION_STEPS:
+        arns = inventory.resources(INVENTORY_TYPES.get(resource_type, resource_type))
+        if not arns:
+            continue
+        print(f"{resource_type}: {len(arns)} resources to delete")
+        delete_function = getattr(importlib.import_module(module_name), function_name)
+        scheduler.add(resource_type, lambda f=delete_function, a=arns: run_step_in_regions(f, a), depends_on)
+
+    return scheduler
+
+
+def run_cleanup(inventory=None, max_workers=16):
+    """
+    Deletes every resource of the inventory, by default the one matching the module's tag filter,
+    and returns {step: (status, duration in seconds)}.
+    """
+    if inventory is None:
+        inventory = get_inventory(tag_key, tag_values, aws_profile, regions=regions)
+    scheduler = build_cleanup_graph(inventory, max_workers)
+
+    start = time.monotonic()
+    results = scheduler.run()
+    failed = [name for name, (status, _) in results.items() if status == "failed"]
+    print(f"Cleanup finished in {time.monotonic() - start:.1f}s: {len(results)} steps, {len(failed)} failed {failed}")
+    print(f"Run journal: {journal.summary()}")
+    for arn, reason in journal.failures().items():
+        print(f"❌ {arn}: {reason}")
+    return results
+
+
+def main():
+    start_run("cleanup_scheduler")
+    run_cleanup()
+
+
+if __name__ == "__main__":
+    main()
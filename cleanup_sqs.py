@@ -1,15 +1,23 @@
-import boto3
-import time
-import concurrent.futures
-from aws_resource_fetcher import get_resources_by_tag, get_id_from_arn
-
-session = boto3.Session(profile_name="idt-qa")
-sqs_client = session.client("sqs")
+import asyncio
+from async_engine import AsyncCleanupEngine
+from resource_inventory import stream_resources
+from resource_record import get_resource
+from status_poller import poller, sqs_queue_checker
+from aws_clients import lazy_client
+from aws_regions import delete_streamed
+from run_journal import journal
+from api_metrics import start_run
 
 tag_key = "tech:team_name"
 tag_values = ["team_boss_wireless", "team_brmobile"]
 resource_type = "sqs:queue"  # AWS ResourceTypeFilters format
-aws_profile = "idt-qa"
+aws_profile = None  # None uses aws_clients.default_profile
+# Regions to clean, e.g. ["us-east-1", "eu-west-1"], "all" for every enabled region, None for the profile's default
+regions = None
+
+sqs_client = lazy_client("sqs", aws_profile)
+
+poller.add_checker(resource_type, sqs_queue_checker(sqs_client), batch_size=1000)
 
 def get_sqs_queue_url(queue_arn):
     """
@@ -19,70 +27,52 @@ def get_sqs_queue_url(queue_arn):
     Input: arn:aws:sqs:us-east-1:123456789012:my-queue
     Output: https://sqs.us-east-1.amazonaws.com/123456789012/my-queue
     """
-    arn_parts = queue_arn.split(":")
-    if len(arn_parts) < 6 or arn_parts[2] != "sqs":
+    queue = get_resource(queue_arn)
+    if queue.service != "sqs":
         raise ValueError(f"Invalid SQS ARN: {queue_arn}")
-
-    region = arn_parts[3]
-    account_id = arn_parts[4]
-    queue_name = arn_parts[5]
-    return f"https://sqs.{region}.amazonaws.com/{account_id}/{queue_name}"
+    return f"https://sqs.{queue.region}.amazonaws.com/{queue.account}/{queue.id}"
 
 
-def wait_for_sqs_deletion(queue_url, max_attempts=30, wait_time=5):
+async def delete_sqs_queue_async(engine, queue_arn, max_attempts=30, wait_time=5, in_flight=False):
     """
-    Waits until an SQS queue is fully deleted by polling get_queue_attributes().
+    Deletes one SQS queue and awaits its deletion in the shared poller.
 
-    :param queue_url: The full SQS Queue URL.
-    :param max_attempts: Maximum number of times to check before timeout.
-    :param wait_time: Time (seconds) to wait between checks.
-    :return: True if queue is deleted, False if timeout.
-    """
-    attempts = 0
-    while attempts < max_attempts:
-        try:
-            sqs_client.get_queue_attributes(QueueUrl=queue_url, AttributeNames=["QueueArn"])
-            print(f"⏳ Queue {queue_url} still exists. Waiting for deletion... ({attempts + 1}/{max_attempts})")
-        except sqs_client.exceptions.QueueDoesNotExist:
-            print(f"✅ Queue {queue_url} successfully deleted.")
-            return True
-        except Exception as e:
-            print(f"⚠️ Error checking queue deletion status: {e}")
-            return False
-
-        time.sleep(wait_time)
-        attempts += 1
-
-    print(f"❌ Timeout: Queue {queue_url} was not deleted after {max_attempts * wait_time} seconds.")
-    return False
-
-
-def delete_sqs_queue(queue_arn):
-    """
-    Deletes an SQS queue and waits until it is fully removed.
-
-    :param queue_url: The full SQS Queue URL.
+    :param in_flight: Deletion was already requested by an earlier run, only wait for it.
     """
     try:
         queue_url = get_sqs_queue_url(queue_arn)
-        sqs_client.delete_queue(QueueUrl=queue_url)
-        print(f"🚀 Requested deletion of SQS Queue: {queue_url}")
-        wait_for_sqs_deletion(queue_url)  # Wait until it's fully deleted
+        if not in_flight:
+            await engine.call_api(sqs_client, "delete_queue", QueueUrl=queue_url)
+            journal.requested(queue_arn)
+            print(f"🚀 Requested deletion of SQS Queue: {queue_url}")
+        if await asyncio.wrap_future(poller.register(resource_type, queue_url, timeout=max_attempts * wait_time)):
+            journal.deleted(queue_arn)
+        else:
+            journal.failed(queue_arn, "still exists after waiting")
     except Exception as e:
+        journal.failed(queue_arn, e)
         print(f"❌ Error deleting SQS Queue {queue_arn}: {e}")
 
 
-sqs_queues = get_resources_by_tag(tag_key, tag_values, resource_type, aws_profile)
-# Print results
-print(f"Total SQS queues found: {len(sqs_queues)}")
+def delete_sqs_queues(sqs_queues, concurrency=None):
+    """
+    Deletes the SQS queues with the given ARNs concurrently on one event loop.
+
+    :param concurrency: Per-service concurrency caps, e.g. {"sqs": 50}.
+    """
+    sqs_queues = journal.unfinished(sqs_queues)
+    in_flight = journal.in_flight(sqs_queues)
+    engine = AsyncCleanupEngine(concurrency)
+    engine.run(delete_sqs_queue_async(engine, que, in_flight=que in in_flight) for que in sqs_queues)
+
 
+def main():
+    start_run("cleanup_sqs")
+    # Queues are deleted page by page while the tagging API is still being paged through
+    pages = stream_resources(tag_key, tag_values, aws_profile, regions, [resource_type])
+    total = delete_streamed(delete_sqs_queues, pages)
+    print(f"Total SQS queues found: {total}")
 
-# Delete alarms in parallel using ThreadPoolExecutor
-with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-    futures = {executor.submit(delete_sqs_queue, get_id_from_arn(que)): que for que in sqs_queues}
 
-    for future in concurrent.futures.as_completed(futures):
-        try:
-            future.result()  # Raise exceptions if any occurred
-        except Exception as e:
-            print(f"❌ Error in thread: {e}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import concurrent.futures
+import time
+
+from cleanup_scheduler import run_cleanup
+from resource_inventory import ResourceInventory, get_inventory
+import run_journal
+from run_journal import journal, DELETE_REQUESTED, DELETED, FAILED
+
+# Seconds between two tagging scans
+interval = 120
+# Seconds before a resource that failed to delete is submitted again
+retry_failed_after = 1800
+# Seconds before a resource whose deletion was requested but not confirmed is submitted again,
+# e.g. an S3 bucket left to lifecycle expiry
+recheck_requested_after = 600
+# Batches being deleted at once, later ones queue until one finishes
+max_batches = 4
+
+
+class InventoryWatcher:
+    """
+    Rescans a tag filter on an interval and sends only the resources that appeared since the
+    previous scan to the deletion scheduler. Submitted resources are remembered while they are
+    still being deleted, or failed, so they are not submitted again; a cycle with nothing new
+    costs one paginated tagging scan per region. Failed resources, and resources whose batch
+    finished with their deletion only requested, are submitted again after a delay. Deleted
+    resources the tagging API still lists once the journal stops trusting their deletion, i.e.
+    re-created under the same ARN, are submitted again as well.
+
+    Scans keep running every interval while earlier batches are still being deleted, and each
+    scan's new resources go out as a batch of their own, so a slow batch (CloudFront, volumes)
+    doesn't hold back resources tagged after it.
+    """
+
+    def __init__(self, tag_key, tag_values, aws_profile=None, regions=None, resource_types=None, max_workers=16):
+        self.tag_key = tag_key
+        self.tag_values = tag_values
+        self.aws_profile = aws_profile
+        self.regions = regions
+        self.resource_types = resource_types
+        self.max_workers = max_workers
+        self.submitted = {}     # ARN -> time it was sent to the scheduler
+        self.running = set()    # ARNs of the batches still being deleted
+
+    def scan(self):
+        """Returns a fresh inventory of the tag filter."""
+        inventory = get_inventory(self.tag_key, self.tag_values, self.aws_profile, refresh=True, regions=self.regions)
+        if self.resource_types is not None:
+            inventory = inventory.subset(self.resource_types)
+        return inventory
+
+    def new_resources(self, inventory):
+        """Returns an inventory of the scanned resources that were not submitted yet, or whose retry is due."""
+        # Resources no longer listed are deleted or untagged, tagging them again submits them again
+        for arn in set(self.submitted) - set(inventory.records):
+            del self.submitted[arn]
+
+        now = time.monotonic()
+        delays = {FAILED: retry_failed_after, DELETE_REQUESTED: recheck_requested_after,
+                  DELETED: run_journal.deleted_ttl}
+        retry = {arn for arn, state in journal.states(set(self.submitted) - self.running).items()
+                 if state in delays and now - self.submitted[arn] >= delays[state]}
+        new = ResourceInventory(inventory.tag_key, inventory.tag_values, [], inventory.regions)
+        for arn, resource in inventory.records.items():
+            if arn not in self.submitted or arn in retry:
+                new.add_record(resource)
+        return new
+
+    def run(self, scan_interval=None, cycles=None):
+        """
+        Watches until interrupted, or for the given number of scans.
+
+        :param scan_interval: Seconds between two scans, `interval` by default.
+        """
+        scan_interval = scan_interval or interval
+        print(f"👀 Watching resources tagged {self.tag_key} in {self.tag_values}, scanning every {scan_interval}s")
+        batches = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_batches, thread_name_prefix="watch") as executor:
+            cycle = 0
+            while cycles is None or cycle < cycles:
+                cycle += 1
+                start = time.monotonic()
+                for batch, arns in [(batch, arns) for batch, arns in batches if batch.done()]:
+                    batches.remove((batch, arns))
+                    self.running -= arns
+                    if batch.exception():
+                        print(f"❌ Batch failed: {batch.exception()}")
+
+                try:
+                    new = self.new_resources(self.scan())
+                except Exception as e:
+                    print(f"❌ Scan failed, retrying in {scan_interval}s: {e}")
+                    new = None
+                if new is not None and new.records:
+                    print(f"🆕 {len(new.records)} new resources to delete: {new.resource_types()}, "
+                          f"{len(batches)} earlier batches still running")
+                    self.submitted.update(dict.fromkeys(new.records, time.monotonic()))
+                    self.running |= set(new.records)
+                    batches.append((executor.submit(run_cleanup, new, self.max_workers), set(new.records)))
+                elif new is not None:
+                    print(f"Nothing new, {len(self.submitted)} resources submitted earlier are still tagged")
+
+                if cycles is None or cycle < cycles:
+                    time.sleep(max(0.0, scan_interval - (time.monotonic() - start)))
+        return self.submitted
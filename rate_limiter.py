@@ -0,0 +1,146 @@
+import functools
+import random
+import threading
+import time
+
+from botocore.config import Config
+
+# Error codes AWS services use to signal throttling
+THROTTLE_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "RequestLimitExceeded",
+    "SlowDown",
+    "ProvisionedThroughputExceededException",
+    "BandwidthLimitExceeded",
+}
+
+# botocore retries throttled calls itself; the limiter makes sure other threads back off too
+retry_config = Config(retries={"max_attempts": 10, "mode": "standard"})
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit of one (service, action), adjusted with additive increase on success
+    and multiplicative decrease on throttling. A throttle also pauses new calls for a
+    jittered, exponentially growing backoff.
+    """
+
+    def __init__(self, initial=8, minimum=1, maximum=100, base_backoff=0.5, max_backoff=20):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.backoff = 0.0
+        self.pause_until = 0.0
+        self.in_flight = 0
+        self.calls = 0
+        self.throttles = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Blocks until a call may start."""
+        with self._condition:
+            while True:
+                wait = self.pause_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    break
+                self._condition.wait(wait if wait > 0 else None)
+            self.in_flight += 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def record_success(self):
+        with self._condition:
+            self.calls += 1
+            if self.limit < self.maximum:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self._condition.notify()
+            self.backoff /= 2
+
+    def record_throttle(self):
+        with self._condition:
+            self.calls += 1
+            self.throttles += 1
+            self.limit = max(self.minimum, self.limit / 2)
+            self.backoff = min(self.max_backoff, max(self.base_backoff, self.backoff * 2))
+            pause = self.backoff * random.uniform(0.5, 1.0)
+            self.pause_until = max(self.pause_until, time.monotonic() + pause)
+
+
+class RateLimiter:
+    """
+    Adaptive rate limiter shared by every client, keyed by region, service and API action,
+    since AWS applies its limits per region. Clients are hooked in through botocore's event
+    system, so every boto3 call made by an installed client waits for a slot and reports
+    whether it was throttled.
+    """
+
+    def __init__(self, initial=8, maximum=100):
+        self.initial = initial
+        self.maximum = maximum
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def limit_for(self, service, action, region=None):
+        key = (region, service, action)
+        with self._lock:
+            if key not in self._limits:
+                self._limits[key] = AdaptiveLimit(initial=self.initial, maximum=self.maximum)
+            return self._limits[key]
+
+    def install(self, client):
+        """Registers the limiter hooks on a boto3 client and returns the client."""
+        events = client.meta.events
+        region = client.meta.region_name
+        events.register("before-call", functools.partial(self._before_call, region), unique_id="rate-limiter-before-call")
+        events.register("needs-retry", functools.partial(self._needs_retry, region), unique_id="rate-limiter-needs-retry")
+        events.register("after-call", self._after_call, unique_id="rate-limiter-after-call")
+        events.register("after-call-error", self._after_call_error, unique_id="rate-limiter-after-call-error")
+        return client
+
+    def _before_call(self, region, model, context, **kwargs):
+        limit = self.limit_for(model.service_model.service_name, model.name, region)
+        limit.acquire()
+        context["rate_limit"] = limit
+
+    def _needs_retry(self, region, operation, response=None, **kwargs):
+        # Called after every attempt, including the ones botocore retries internally
+        if response is None:
+            return None
+        error_code = response[1].get("Error", {}).get("Code")
+        if error_code in THROTTLE_ERROR_CODES:
+            self.limit_for(operation.service_model.service_name, operation.name, region).record_throttle()
+            print(f"⚠️ Throttled on {operation.service_model.service_name}:{operation.name} in {region}, backing off")
+        return None
+
+    def _after_call(self, http_response, context, **kwargs):
+        limit = context.pop("rate_limit", None)
+        if limit is None:
+            return
+        limit.release()
+        if http_response.status_code < 300:
+            limit.record_success()
+
+    def _after_call_error(self, context, **kwargs):
+        limit = context.pop("rate_limit", None)
+        if limit is not None:
+            limit.release()
+
+    def stats(self):
+        """Returns {(region, service, action): (current limit, calls, throttles)}."""
+        with self._lock:
+            return {key: (int(limit.limit), limit.calls, limit.throttles) for key, limit in self._limits.items()}
+
+
+# Shared by all clients in the process
+rate_limiter = RateLimiter()
+
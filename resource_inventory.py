@@ -0,0 +1,226 @@
+import queue
+import threading
+from aws_clients import get_client
+from aws_regions import resolve_regions, run_in_regions
+from resource_record import get_resource
+from run_journal import journal
+
+
+def get_resource_type(arn):
+    """
+    Returns the Resource Groups Tagging API resource type ("service:type") of an ARN.
+
+    Example:
+    Input: arn:aws:ec2:us-east-1:123456789012:instance/i-0123456789abcdef0
+    Output: ec2:instance
+    """
+    return get_resource(arn).resource_type
+
+
+def get_arn_region(arn):
+    """Returns the region of an ARN, or "global" for global services like S3 and CloudFront."""
+    return get_resource(arn).region or "global"
+
+
+def iter_tagged_pages(tag_key, tag_values, aws_profile, region=None, resource_types=None):
+    """
+    Yields the raw ResourceTagMappingList of each Resource Groups Tagging API page of one region
+    as soon as it arrives.
+
+    :param resource_types: Tagging API resource type filters, e.g. ["sqs:queue"], None for every type.
+    """
+    tagging_client = get_client("resourcegroupstaggingapi", aws_profile, region)
+    paginator = tagging_client.get_paginator("get_resources")
+    filters = {"ResourceTypeFilters": list(resource_types)} if resource_types else {}
+
+    for page in paginator.paginate(TagFilters=[{"Key": tag_key, "Values": tag_values}], **filters):
+        yield page.get("ResourceTagMappingList", [])
+
+
+def scan_tagged_resources(tag_key, tag_values, aws_profile, region=None):
+    """
+    Pages through the Resource Groups Tagging API of one region once for the given tag filter.
+    Returns the raw ResourceTagMappingList entries of every resource type.
+    """
+    mappings = []
+    for page in iter_tagged_pages(tag_key, tag_values, aws_profile, region):
+        mappings.extend(page)
+
+    print(f"Tag scan {tag_key}={tag_values} in {region or 'default region'} found {len(mappings)} resources")
+    return mappings
+
+
+def scan_regions(tag_key, tag_values, aws_profile, regions=None):
+    """Scans the tagging API of every region concurrently and returns the merged mappings."""
+    results = run_in_regions({region: (lambda r=region: scan_tagged_resources(tag_key, tag_values, aws_profile, r))
+                              for region in resolve_regions(regions, aws_profile)}, label="Tag scan")
+    mappings = []
+    for region, result in results.items():
+        if isinstance(result, Exception):
+            raise result
+        mappings.extend(result)
+    return mappings
+
+
+def stream_resources(tag_key, tag_values, aws_profile, regions=None, resource_types=None, pages_buffered=4):
+    """
+    Yields tagged resources page by page while the tagging API is still being paged through,
+    so deletions can start with the first page. Every region is scanned in its own thread.
+    Each page is recorded in the run journal and comes as a list of Resource records. Resources
+    the journal has recently confirmed deleted are left to the delete functions to skip.
+
+    Scanner threads wait while `pages_buffered` pages are waiting to be consumed, so memory
+    stays bounded however many resources the account has.
+    """
+    pages = queue.Queue(maxsize=pages_buffered)
+    stop = threading.Event()
+
+    def offer(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=1)
+                return
+            except queue.Full:
+                pass
+
+    def scan(region):
+        try:
+            for page in iter_tagged_pages(tag_key, tag_values, aws_profile, region, resource_types):
+                offer(page)
+                if stop.is_set():
+                    return
+        except Exception as e:
+            offer(e)
+        finally:
+            offer(None)
+
+    scanning = resolve_regions(regions, aws_profile)
+    for region in scanning:
+        threading.Thread(target=scan, args=(region,), name=f"scan-{region or 'default'}", daemon=True).start()
+
+    try:
+        remaining = len(scanning)
+        while remaining:
+            page = pages.get()
+            if page is None:
+                remaining -= 1
+                continue
+            if isinstance(page, Exception):
+                raise page
+
+            arns = [mapping["ResourceARN"] for mapping in page]
+            journal.discovered(arns)
+            resources = [get_resource(mapping["ResourceARN"], {t["Key"]: t["Value"] for t in mapping.get("Tags", [])})
+                         for mapping in page]
+            if resource_types:
+                resources = [r for r in resources if r.resource_type in resource_types or r.service in resource_types]
+            if resources:
+                yield resources
+    finally:
+        # Lets the scanner threads finish if the consumer stops early
+        stop.set()
+
+
+class ResourceInventory:
+    """
+    In-memory index of tagged resources built from a single tagging API scan.
+    Resources are kept as records with their tags, see resource_record.Resource, and
+    indexed by service, resource type, region and value of the filter tag.
+    """
+
+    def __init__(self, tag_key, tag_values, mappings, regions=None):
+        self.tag_key = tag_key
+        self.tag_values = list(tag_values)
+        self.regions = regions
+        self.records = {}   # ARN -> Resource, in scan order
+        self._by_type = {}
+        self._by_region = {}
+        self._by_tag_value = {}
+
+        for mapping in mappings:
+            self.add(mapping["ResourceARN"], mapping.get("Tags", []))
+
+    def add(self, arn, tags):
+        """Adds a resource with its tagging API tags ([{"Key": ..., "Value": ...}]) to every index."""
+        if arn not in self.records:
+            self.add_record(get_resource(arn, {t["Key"]: t["Value"] for t in tags}))
+
+    def add_record(self, resource):
+        """Adds an already parsed resource to every index."""
+        arn = resource.arn
+        if arn in self.records:
+            return
+        self.records[arn] = resource
+        self._by_type.setdefault(resource.resource_type, []).append(arn)
+        if resource.service != resource.resource_type:
+            self._by_type.setdefault(resource.service, []).append(arn)
+        self._by_region.setdefault(resource.region or "global", set()).add(arn)
+        self._by_tag_value.setdefault(resource.tags.get(self.tag_key), set()).add(arn)
+
+    def covers(self, tag_key, tag_values, regions=None):
+        """Checks whether this inventory contains every resource matching the given tag filter and regions."""
+        return tag_key == self.tag_key and set(tag_values) <= set(self.tag_values) and regions == self.regions
+
+    def resources(self, resource_type=None, region=None, tag_values=None):
+        """
+        Returns ARNs matching the given filters, in scan order.
+
+        :param resource_type: Tagging API resource type filter, e.g. "ec2:instance" or just "s3".
+        :param region: Only return resources in this region ("global" for S3/CloudFront).
+        :param tag_values: Only return resources whose filter tag has one of these values.
+        """
+        if resource_type:
+            arns = self._by_type.get(resource_type, [])
+        else:
+            arns = list(self.records)
+
+        if region:
+            in_region = self._by_region.get(region, set())
+            arns = [arn for arn in arns if arn in in_region]
+
+        if tag_values is not None:
+            matching = set()
+            for value in tag_values:
+                matching |= self._by_tag_value.get(value, set())
+            arns = [arn for arn in arns if arn in matching]
+
+        return list(arns)
+
+    def resource_types(self):
+        """Returns the resource counts per "service:type"."""
+        return {rt: len(arns) for rt, arns in self._by_type.items() if ":" in rt}
+
+    def subset(self, resource_types):
+        """Returns a new inventory with only the resources of the given types, e.g. "ec2:instance" or "s3"."""
+        subset = ResourceInventory(self.tag_key, self.tag_values, [], self.regions)
+        for resource_type in resource_types:
+            for arn in self.resources(resource_type):
+                subset.add_record(self.records[arn])
+        return subset
+
+
+_inventories = {}
+_inventories_lock = threading.Lock()
+
+
+def get_inventory(tag_key, tag_values, aws_profile, refresh=False, regions=None):
+    """
+    Returns a shared inventory for the tag filter, scanning the tagging API only when
+    no inventory built earlier in this process already covers it. Resources are recorded in the
+    run journal; the ones it has recently confirmed deleted are skipped by the delete functions.
+
+    :param regions: Regions to scan concurrently, "all" for every enabled region,
+                    None for the profile's default region only.
+    """
+    with _inventories_lock:
+        if not refresh:
+            for (profile, _, _, _), inventory in _inventories.items():
+                if profile == aws_profile and inventory.covers(tag_key, tag_values, regions):
+                    return inventory
+
+        mappings = scan_regions(tag_key, tag_values, aws_profile, regions)
+        arns = [mapping["ResourceARN"] for mapping in mappings]
+        journal.discovered(arns)
+        inventory = ResourceInventory(tag_key, tag_values, mappings, regions)
+        _inventories[(aws_profile, str(regions), tag_key, tuple(sorted(tag_values)))] = inventory
+        return inventory
@@ -0,0 +1,70 @@
+import sys
+import weakref
+
+# Services whose ARNs name the resource without a type, and the type their resources have
+UNTYPED_SERVICES = {"s3": "bucket", "sqs": "queue"}
+
+
+class Resource:
+    """
+    A tagged resource with its ARN parsed once. Partition, service, region, account and type
+    strings are interned, so a large inventory keeps one copy of each instead of one per
+    resource, and __slots__ keeps each record to a fixed handful of references.
+
+    Example:
+    arn:aws:ec2:us-east-1:123456789012:instance/i-0123456789abcdef0
+    -> service "ec2", region "us-east-1", type "instance", id "i-0123456789abcdef0",
+       resource_type "ec2:instance"
+    Global resources (S3, CloudFront) have an empty region.
+    """
+
+    __slots__ = ("arn", "partition", "service", "region", "account", "type", "id", "resource_type", "tags",
+                 "__weakref__")
+
+    def __init__(self, arn, tags=None):
+        parts = arn.split(":", 5)
+        if len(parts) < 6 or parts[0] != "arn":
+            raise ValueError(f"Invalid ARN format: {arn}")
+        _, partition, service, region, account, resource = parts
+
+        if service in UNTYPED_SERVICES:
+            resource_type, resource_id = UNTYPED_SERVICES[service], resource
+        else:
+            # The type ends at the first "/" or ":", e.g. "task-definition/family:3" or "alarm:name"
+            separators = [i for i in (resource.find("/"), resource.find(":")) if i >= 0]
+            if separators:
+                resource_type, resource_id = resource[:min(separators)], resource[min(separators) + 1:]
+            else:
+                resource_type, resource_id = "", resource
+
+        self.arn = arn
+        self.partition = sys.intern(partition)
+        self.service = sys.intern(service)
+        self.region = sys.intern(region)
+        self.account = sys.intern(account)
+        self.type = sys.intern(resource_type)
+        self.id = resource_id
+        self.resource_type = sys.intern(f"{service}:{resource_type}" if resource_type else service)
+        self.tags = tags if tags is not None else {}
+
+    def __repr__(self):
+        return f"Resource({self.arn!r})"
+
+
+# ARN -> Resource of every resource still held by an inventory or a discovery page. Records nothing
+# refers to anymore are dropped, so streaming through a large account keeps memory bounded.
+_resources = weakref.WeakValueDictionary()
+
+
+def get_resource(arn, tags=None):
+    """
+    Returns the record of an ARN, parsing the ARN only when no live record of it exists.
+
+    :param tags: {key: value} tags from a scan, replacing the ones the record had.
+    """
+    resource = _resources.get(arn)
+    if resource is None:
+        resource = _resources.setdefault(arn, Resource(arn))
+    if tags is not None:
+        resource.tags = tags
+    return resource
@@ -0,0 +1,122 @@
+import sqlite3
+import threading
+import time
+
+from api_metrics import metrics
+
+# Resource states, in the order a resource normally goes through them
+DISCOVERED = "discovered"
+DELETE_REQUESTED = "delete_requested"
+DELETED = "deleted"
+FAILED = "failed"
+
+# Delete this file to make the next run start from scratch
+journal_path = "cleanup_journal.db"
+# Seconds a confirmed deletion is trusted. The tagging API keeps listing deleted resources for a while;
+# one still listed after this was re-created under the same name (SQS queues, S3 buckets, alarms) and
+# is deleted again.
+deleted_ttl = 3600
+
+
+class RunJournal:
+    """
+    Durable record of every resource a cleanup run has seen, keyed by ARN, stored in SQLite.
+
+    Discovery skips resources recently confirmed deleted, so a rerun makes no API call for
+    them, and steps that wait for a deletion to finish skip the delete call for resources
+    whose deletion was already requested. Each write is committed immediately, so an
+    interrupted run loses nothing it already recorded.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path or journal_path, timeout=30,
+                                               isolation_level=None, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS resources ("
+                "arn TEXT PRIMARY KEY, state TEXT NOT NULL, reason TEXT, updated_at REAL NOT NULL)")
+        return self._connection
+
+    def discovered(self, arns):
+        """Records newly found resources, keeping the state of resources seen by earlier runs."""
+        now = time.time()
+        with self._lock:
+            self._db().executemany("INSERT OR IGNORE INTO resources VALUES (?, ?, NULL, ?)",
+                                   [(arn, DISCOVERED, now) for arn in arns])
+
+    def record(self, arns, state, reason=None):
+        """Sets the state of one ARN or a list of ARNs."""
+        if isinstance(arns, str):
+            arns = [arns]
+        now = time.time()
+        with self._lock:
+            self._db().executemany("INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?)",
+                                   [(arn, state, reason, now) for arn in arns])
+        for arn in arns:
+            metrics.event("resource_state", arn=arn, state=state, reason=reason)
+
+    def requested(self, arns):
+        self.record(arns, DELETE_REQUESTED)
+
+    def deleted(self, arns):
+        self.record(arns, DELETED)
+
+    def failed(self, arns, reason):
+        self.record(arns, FAILED, str(reason))
+
+    def _rows(self, arns, columns):
+        """Returns {arn: (columns...)} for the given ARNs the journal knows about."""
+        rows = {}
+        arns = list(arns)
+        with self._lock:
+            db = self._db()
+            # Stay under SQLite's limit on bound parameters
+            for i in range(0, len(arns), 500):
+                batch = arns[i:i + 500]
+                query = f"SELECT arn, {columns} FROM resources WHERE arn IN ({','.join('?' * len(batch))})"
+                rows.update((arn, values) for arn, *values in db.execute(query, batch))
+        return rows
+
+    def states(self, arns):
+        """Returns {arn: state} for the given ARNs the journal knows about."""
+        return {arn: state for arn, (state,) in self._rows(arns, "state").items()}
+
+    def unfinished(self, arns):
+        """Returns the ARNs not confirmed deleted within the last `deleted_ttl` seconds, in their original order."""
+        arns = list(arns)
+        rows = self._rows(arns, "state, updated_at")
+        expiry = time.time() - deleted_ttl
+        remaining = [arn for arn in arns if arn not in rows or rows[arn][0] != DELETED or rows[arn][1] < expiry]
+        if len(remaining) < len(arns):
+            print(f"⏭️ Skipping {len(arns) - len(remaining)} resources the run journal has as deleted")
+        return remaining
+
+    def in_flight(self, arns):
+        """Returns the subset of ARNs whose deletion was requested but not confirmed yet."""
+        return {arn for arn, state in self.states(arns).items() if state == DELETE_REQUESTED}
+
+    def summary(self):
+        """Returns {state: number of resources}."""
+        with self._lock:
+            return dict(self._db().execute("SELECT state, COUNT(*) FROM resources GROUP BY state"))
+
+    def failures(self):
+        """Returns {arn: reason} of every failed resource."""
+        with self._lock:
+            return dict(self._db().execute("SELECT arn, reason FROM resources WHERE state = ?", (FAILED,)))
+
+    def reset(self):
+        """Forgets every recorded resource."""
+        with self._lock:
+            self._db().execute("DELETE FROM resources")
+
+
+# Shared by every cleanup module in the process
+journal = RunJournal()
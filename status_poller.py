@@ -0,0 +1,234 @@
+import concurrent.futures
+import threading
+import time
+
+from api_metrics import metrics
+from aws_clients import current_region, using_region
+
+
+def chunks(items, size):
+    """Splits a list into consecutive chunks of at most `size` items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class BatchStatusPoller:
+    """
+    Central poller for resources waiting to disappear (or to reach another state, such as
+    a disabled CloudFront distribution).
+
+    Resources register with a type and ID and get back a Future. On every tick the poller
+    checks all pending resources of a type with as few describe calls as the API allows,
+    and resolves each Future with True as soon as its resource is gone, or with False once
+    its timeout passes. API traffic while waiting scales with the number of resource types,
+    not with the number of resources.
+
+    Resources are tracked in the region that was current when they were registered and
+    checked with that region's clients.
+    """
+
+    def __init__(self):
+        self._checkers = {}
+        self._pending = {}
+        self._next_check = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def add_checker(self, resource_type, check_remaining, batch_size=100, interval=5, state="deleted"):
+        """
+        Registers how to check a resource type.
+
+        :param resource_type: Resource type name, e.g. "ec2:security-group".
+        :param check_remaining: Function taking a list of IDs and returning the set of IDs that still exist.
+        :param batch_size: Maximum number of IDs passed to check_remaining at once.
+        :param interval: Seconds between two checks of this type.
+        :param state: What the poller waits for, used in progress messages.
+        """
+        with self._lock:
+            self._checkers[resource_type] = (check_remaining, batch_size, interval, state)
+
+    def register(self, resource_type, resource_id, timeout=150):
+        """
+        Starts tracking a resource until it is gone.
+
+        :return: A Future resolved with True once the resource is gone, False after `timeout` seconds.
+        """
+        if resource_type not in self._checkers:
+            raise ValueError(f"No status checker registered for {resource_type}")
+
+        key = (current_region.get(), resource_id)
+        with self._lock:
+            pending = self._pending.setdefault(resource_type, {})
+            if key in pending:
+                return pending[key][0]
+            future = concurrent.futures.Future()
+            pending[key] = (future, time.monotonic(), time.monotonic() + timeout)
+            self._next_check.setdefault(resource_type, time.monotonic())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="status-poller", daemon=True)
+                self._thread.start()
+
+        self._wakeup.set()
+        return future
+
+    def wait(self, resource_type, resource_ids, timeout=150):
+        """Registers resources and blocks until each of them is gone or timed out. Returns {id: bool}."""
+        futures = {resource_id: self.register(resource_type, resource_id, timeout) for resource_id in resource_ids}
+        return {resource_id: future.result() for resource_id, future in futures.items()}
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not any(self._pending.values()):
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                due = [rt for rt, ids in self._pending.items() if ids and self._next_check[rt] <= now]
+                next_due = min(self._next_check[rt] for rt, ids in self._pending.items() if ids)
+
+            if not due:
+                self._wakeup.wait(max(0.0, next_due - now))
+                self._wakeup.clear()
+                continue
+
+            for resource_type in due:
+                self._check(resource_type)
+
+    def _check(self, resource_type):
+        check_remaining, batch_size, interval, state = self._checkers[resource_type]
+        with self._lock:
+            keys = list(self._pending[resource_type])
+            self._next_check[resource_type] = time.monotonic() + interval
+
+        by_region = {}
+        for region, resource_id in keys:
+            by_region.setdefault(region, []).append(resource_id)
+
+        remaining = set()
+        for region, resource_ids in by_region.items():
+            with using_region(region):
+                for batch in chunks(resource_ids, batch_size):
+                    try:
+                        remaining |= {(region, resource_id) for resource_id in check_remaining(batch)}
+                    except Exception as e:
+                        print(f"⚠️ Error checking {resource_type} status in {region or 'default region'}: {e}")
+                        remaining |= {(region, resource_id) for resource_id in batch}
+
+        now = time.monotonic()
+        with self._lock:
+            pending = self._pending[resource_type]
+            for key in keys:
+                future, registered, deadline = pending[key]
+                resource_id = key[1]
+                if key not in remaining or now >= deadline:
+                    metrics.record_wait(resource_type, now - registered)
+                if key not in remaining:
+                    print(f"✅ {resource_type} {resource_id} is {state}.")
+                    del pending[key]
+                    future.set_result(True)
+                elif now >= deadline:
+                    print(f"❌ Timeout: {resource_type} {resource_id} was not {state} in time.")
+                    del pending[key]
+                    future.set_result(False)
+            if pending:
+                print(f"⏳ Waiting for {len(pending)} {resource_type} resources to be {state}...")
+
+
+def security_group_checker(ec2_client):
+    """Returns a check_remaining function for security groups using one filtered describe per batch."""
+    def check_remaining(group_ids):
+        paginator = ec2_client.get_paginator("describe_security_groups")
+        pages = paginator.paginate(Filters=[{"Name": "group-id", "Values": group_ids}])
+        return {sg["GroupId"] for page in pages for sg in page["SecurityGroups"]}
+    return check_remaining
+
+
+def network_interface_checker(ec2_client):
+    """Returns a check_remaining function for network interfaces using one filtered describe per batch."""
+    def check_remaining(interface_ids):
+        paginator = ec2_client.get_paginator("describe_network_interfaces")
+        pages = paginator.paginate(Filters=[{"Name": "network-interface-id", "Values": interface_ids}])
+        return {ni["NetworkInterfaceId"] for page in pages for ni in page["NetworkInterfaces"]
+                if ni.get("Status") != "deleted"}
+    return check_remaining
+
+
+def volume_checker(ec2_client):
+    """Returns a check_remaining function for EBS volumes using one filtered describe per batch."""
+    def check_remaining(volume_ids):
+        paginator = ec2_client.get_paginator("describe_volumes")
+        pages = paginator.paginate(Filters=[{"Name": "volume-id", "Values": volume_ids}])
+        return {vol["VolumeId"] for page in pages for vol in page["Volumes"] if vol["State"] != "deleted"}
+    return check_remaining
+
+
+def snapshot_checker(ec2_client):
+    """Returns a check_remaining function for EBS snapshots of the account using one filtered describe per batch."""
+    def check_remaining(snapshot_ids):
+        paginator = ec2_client.get_paginator("describe_snapshots")
+        pages = paginator.paginate(OwnerIds=["self"], Filters=[{"Name": "snapshot-id", "Values": snapshot_ids}])
+        return {snapshot["SnapshotId"] for page in pages for snapshot in page["Snapshots"]}
+    return check_remaining
+
+
+def network_interface_detached_checker(ec2_client):
+    """
+    Returns a check_remaining function for network interfaces that are not yet available,
+    i.e. still attached or detaching, using one filtered describe per batch.
+    """
+    def check_remaining(interface_ids):
+        paginator = ec2_client.get_paginator("describe_network_interfaces")
+        pages = paginator.paginate(Filters=[{"Name": "network-interface-id", "Values": interface_ids}])
+        return {ni["NetworkInterfaceId"] for page in pages for ni in page["NetworkInterfaces"]
+                if ni["Status"] != "available"}
+    return check_remaining
+
+
+def volume_detached_checker(ec2_client):
+    """Returns a check_remaining function for EBS volumes that are still attached, using one filtered describe per batch."""
+    def check_remaining(volume_ids):
+        paginator = ec2_client.get_paginator("describe_volumes")
+        pages = paginator.paginate(Filters=[{"Name": "volume-id", "Values": volume_ids}])
+        return {vol["VolumeId"] for page in pages for vol in page["Volumes"] if vol["State"] == "in-use"}
+    return check_remaining
+
+
+def alarm_checker(cloudwatch_client):
+    """Returns a check_remaining function for CloudWatch alarms, up to 100 names per describe_alarms."""
+    def check_remaining(alarm_names):
+        paginator = cloudwatch_client.get_paginator("describe_alarms")
+        pages = paginator.paginate(AlarmNames=alarm_names, AlarmTypes=["MetricAlarm", "CompositeAlarm"])
+        return {alarm["AlarmName"] for page in pages
+                for alarm in page.get("MetricAlarms", []) + page.get("CompositeAlarms", [])}
+    return check_remaining
+
+
+def sqs_queue_checker(sqs_client):
+    """Returns a check_remaining function for SQS queue URLs using one paginated list_queues per tick."""
+    def check_remaining(queue_urls):
+        paginator = sqs_client.get_paginator("list_queues")
+        existing = {url for page in paginator.paginate(PaginationConfig={"PageSize": 1000})
+                    for url in page.get("QueueUrls", [])}
+        return {url for url in queue_urls if url in existing}
+    return check_remaining
+
+
+def cloudfront_disabled_checker(cloudfront_client):
+    """
+    Returns a check_remaining function for CloudFront distribution IDs that are not yet
+    disabled and deployed, using one paginated list_distributions per tick. Distributions
+    no longer listed, e.g. deleted by someone else, are done as well.
+    """
+    def check_remaining(distribution_ids):
+        pending = set()
+        paginator = cloudfront_client.get_paginator("list_distributions")
+        for page in paginator.paginate():
+            for distribution in page["DistributionList"].get("Items", []):
+                if distribution["Enabled"] or distribution["Status"] != "Deployed":
+                    pending.add(distribution["Id"])
+        return set(distribution_ids) & pending
+    return check_remaining
+
+
+# Shared poller every cleanup module registers its waiting resources with
+poller = BatchStatusPoller()